@@ -8,9 +8,9 @@ from config import Config
 db = SQLAlchemy()
 jwt = JWTManager()
 
-def create_app():
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
 
     # Enable CORS properly
     CORS(
@@ -32,6 +32,21 @@ def create_app():
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(property_bp)
     app.register_blueprint(analysis_bp, url_prefix="/analysis")
+
+    from app.services.jobs import init_jobs
+    init_jobs(app)
+
+    from app.services.response_cache import init_response_cache
+    init_response_cache(app)
+
+    from app.instrumentation import init_instrumentation
+    init_instrumentation(app)
+
+    from app.profiling import init_profiling
+    init_profiling(app)
+
+    from app.commands import register_commands
+    register_commands(app)
    
     @app.route("/")
     def health_check():
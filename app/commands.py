@@ -0,0 +1,117 @@
+import json
+import click
+from app import db
+from app.migrations import upgrade, backfill_rating_aggregates
+from app.services.image_derivatives import generate_derivatives, pending_image_ids
+from app.services.jobs import enqueue, job_stats
+from app.services.market_sketches import rebuild_market_sketches
+from app.services.prediction_service import recompute_predictions
+from app.services.property_import import detect_format, import_listings
+
+
+def register_commands(app):
+
+    # =========================================================
+    # SCHEMA
+    # =========================================================
+    @app.cli.command("upgrade-db")
+    def upgrade_db():
+        """Create missing tables and apply schema migrations."""
+        upgrade()
+        click.echo("Database schema is up to date.")
+
+    # =========================================================
+    # BACKFILLS
+    # =========================================================
+    @app.cli.command("backfill-ratings")
+    def backfill_ratings():
+        """Recompute review_count / rating_sum for every property."""
+        updated = backfill_rating_aggregates()
+        db.session.commit()
+        click.echo(f"Rating aggregates refreshed for {updated} properties.")
+
+    # =========================================================
+    # PREDICTIONS
+    # =========================================================
+    @app.cli.command("recompute-predictions")
+    @click.option("--batch-size", default=500, show_default=True)
+    @click.option("--force", is_flag=True, help="Recompute even fresh rows.")
+    @click.option("--enqueue", "queue_it", is_flag=True, help="Hand off to the job queue.")
+    def recompute_predictions_command(batch_size, force, queue_it):
+        """Store fresh predictions for properties whose last one is stale."""
+        if queue_it:
+            enqueue("recompute_predictions", batch_size=batch_size, force=force)
+            db.session.commit()
+            click.echo("Queued prediction recompute.")
+            return
+
+        updated = recompute_predictions(batch_size=batch_size, force=force)
+        click.echo(f"Stored {updated} new predictions.")
+
+    # =========================================================
+    # MARKET SKETCHES
+    # =========================================================
+    @app.cli.command("build-market-sketches")
+    @click.option("--chunk-size", default=5000, show_default=True)
+    def build_market_sketches(chunk_size):
+        """Rebuild every per-segment rent sketch from the properties table."""
+        segments = rebuild_market_sketches(chunk_size=chunk_size)
+        click.echo(f"Built {segments} segment sketches.")
+
+    # =========================================================
+    # BULK IMPORT
+    # =========================================================
+    @app.cli.command("import-properties")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--owner-email", required=True, help="Account the listings belong to.")
+    @click.option("--format", "fmt", type=click.Choice(["csv", "jsonl"]), default=None)
+    @click.option("--chunk-size", default=1000, show_default=True)
+    def import_properties(path, owner_email, fmt, chunk_size):
+        """Stream a CSV / JSONL file of listings into the properties table."""
+        from app.models.user import User
+
+        owner = User.query.filter_by(email=owner_email).first()
+        if owner is None:
+            raise click.ClickException(f"No user with email {owner_email}")
+
+        fmt = fmt or detect_format(filename=path)
+        if fmt is None:
+            raise click.ClickException("Pass --format for files without a .csv/.jsonl extension")
+
+        with open(path, "rb") as f:
+            for update in import_listings(f, fmt, owner.id, chunk_size=chunk_size):
+                if update.get("done"):
+                    break
+                click.echo(f"{update['processed']} rows read, {update['inserted']} inserted, {update['failed']} failed")
+
+        for error in update["errors"]:
+            click.echo(f"  row {error['row']}: {error['error']}", err=True)
+
+        click.echo(f"Imported {update['inserted']} of {update['processed']} rows ({update['failed']} failed).")
+
+    # =========================================================
+    # IMAGE DERIVATIVES
+    # =========================================================
+    @app.cli.command("generate-image-derivatives")
+    def generate_image_derivatives():
+        """Render WebP thumbnail / medium variants for images missing them."""
+        done = failed = 0
+
+        for image_id in pending_image_ids():
+            try:
+                if generate_derivatives(image_id):
+                    done += 1
+            except Exception as e:
+                db.session.rollback()
+                failed += 1
+                click.echo(f"Image {image_id} failed: {e}")
+
+        click.echo(f"Generated derivatives for {done} images ({failed} failed).")
+
+    # =========================================================
+    # JOBS
+    # =========================================================
+    @app.cli.command("job-stats")
+    def job_stats_command():
+        """Show job queue depth by status and this process's job counters."""
+        click.echo(json.dumps(job_stats(), indent=2, default=str))
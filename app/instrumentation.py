@@ -0,0 +1,252 @@
+import threading
+import time
+from contextlib import contextmanager
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+
+# Per-request time buckets reported in Server-Timing
+TIMING_KINDS = ("db", "model", "external")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+# =========================================================
+# PER-REQUEST TIMERS
+# =========================================================
+def _request_timings():
+    # None outside a request (CLI, job threads), where nothing is recorded
+    if has_app_context():
+        return g.get("timings")
+    return None
+
+
+def record(kind, seconds):
+    timings = _request_timings()
+    if timings is not None:
+        timings[kind] += seconds
+
+
+@contextmanager
+def timed(kind):
+    # Adds the block's wall time to the current request's `kind` bucket
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(kind, time.perf_counter() - started)
+
+
+# =========================================================
+# PROMETHEUS-STYLE METRICS
+# =========================================================
+class Histogram:
+
+    def __init__(self, name, help_text, buckets, labels):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.labels = labels
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                base = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, key))
+                for bound, n in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {n}')
+                lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{base}}} {total}")
+                lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+
+class Counter:
+
+    def __init__(self, name, help_text, labels):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                base = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, key))
+                lines.append(f"{self.name}{{{base}}} {value}")
+        return lines
+
+
+REQUESTS = Counter(
+    "rentwise_requests_total", "Requests handled.",
+    ("blueprint", "method", "status")
+)
+REQUEST_SECONDS = Histogram(
+    "rentwise_request_duration_seconds", "Request wall time.",
+    LATENCY_BUCKETS, ("blueprint", "method")
+)
+PHASE_SECONDS = {
+    kind: Histogram(
+        f"rentwise_request_{kind}_seconds", f"Per-request time spent in {kind}.",
+        LATENCY_BUCKETS, ("blueprint",)
+    )
+    for kind in TIMING_KINDS
+}
+DB_STATEMENTS = Histogram(
+    "rentwise_request_db_statements", "SQL statements per request.",
+    STATEMENT_BUCKETS, ("blueprint",)
+)
+SLOW_QUERIES = Counter(
+    "rentwise_slow_queries_total", "Statements slower than SLOW_QUERY_MS.",
+    ("blueprint",)
+)
+
+
+def render_metrics():
+    from app.services.jobs import metrics as job_metrics
+
+    lines = []
+    for metric in (REQUESTS, REQUEST_SECONDS, *PHASE_SECONDS.values(), DB_STATEMENTS, SLOW_QUERIES):
+        lines.extend(metric.render())
+
+    lines += ["# HELP rentwise_jobs_total Background job events in this process.", "# TYPE rentwise_jobs_total counter"]
+    for name, counts in sorted(job_metrics.stats().items()):
+        for event_name, value in counts.items():
+            if event_name != "run_seconds":
+                lines.append(f'rentwise_jobs_total{{job="{name}",event="{event_name}"}} {value}')
+
+    from app.services.response_cache import cache_stats
+
+    stats = cache_stats()
+    if stats:
+        lines += ["# HELP rentwise_response_cache Response cache counters in this process.", "# TYPE rentwise_response_cache gauge"]
+        for name, value in sorted(stats.items()):
+            if isinstance(value, (int, float)):
+                lines.append(f'rentwise_response_cache{{backend="{stats["backend"]}",stat="{name}"}} {value}')
+
+    return "\n".join(lines) + "\n"
+
+
+# =========================================================
+# SQLALCHEMY EVENTS
+# =========================================================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    timings = _request_timings()
+    if timings is not None:
+        timings["db"] += elapsed
+        g.db_statements += 1
+
+    if not has_app_context():
+        return
+
+    threshold = current_app.config["SLOW_QUERY_MS"]
+    if threshold and elapsed * 1000 >= threshold:
+        blueprint = (request.blueprint if timings is not None else None) or "none"
+        SLOW_QUERIES.inc(blueprint=blueprint)
+        current_app.logger.warning(
+            "SLOW QUERY (%.1f ms, %s): %s",
+            elapsed * 1000, blueprint, " ".join(statement.split())[:500]
+        )
+
+
+def _handle_error(context):
+    # after_cursor_execute never fires for a failed statement
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+# =========================================================
+# REQUEST HOOKS
+# =========================================================
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.timings = dict.fromkeys(TIMING_KINDS, 0.0)
+    g.db_statements = 0
+
+
+def _finish_request(response):
+    if "request_started" not in g:
+        return response
+
+    elapsed = time.perf_counter() - g.request_started
+    blueprint = request.blueprint or "app"
+    timings = g.timings
+
+    REQUESTS.inc(blueprint=blueprint, method=request.method, status=str(response.status_code))
+    REQUEST_SECONDS.observe(elapsed, blueprint=blueprint, method=request.method)
+    DB_STATEMENTS.observe(g.db_statements, blueprint=blueprint)
+    for kind in TIMING_KINDS:
+        PHASE_SECONDS[kind].observe(timings[kind], blueprint=blueprint)
+
+    if current_app.config["SERVER_TIMING_ENABLED"]:
+        parts = [f'db;dur={timings["db"] * 1000:.2f};desc="{g.db_statements} queries"']
+        parts += [f"{kind};dur={timings[kind] * 1000:.2f}" for kind in TIMING_KINDS if kind != "db"]
+        parts.append(f"total;dur={elapsed * 1000:.2f}")
+        response.headers["Server-Timing"] = ", ".join(parts)
+
+    return response
+
+
+def _metrics_endpoint():
+    # Closed unless a token is configured or the endpoint is explicitly public
+    token = current_app.config["METRICS_TOKEN"]
+    if token:
+        allowed = request.headers.get("Authorization") == f"Bearer {token}"
+    else:
+        allowed = current_app.config["METRICS_PUBLIC"]
+
+    if not allowed:
+        return Response("Forbidden\n", status=403, mimetype="text/plain")
+
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+def init_instrumentation(app):
+    """Wire request timers, SQL events and /metrics into the app.
+
+    Metrics are per process; with several gunicorn workers each one
+    exposes its own series, so scrape them per worker or aggregate.
+    """
+    if not app.config["INSTRUMENTATION_ENABLED"]:
+        return
+
+    from app import db
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule("/metrics", "metrics", _metrics_endpoint)
@@ -0,0 +1,206 @@
+from sqlalchemy import inspect, text
+from app import db
+
+# Make sure every model is registered before create_all runs
+import app.models.user  # noqa: F401
+import app.models.property  # noqa: F401
+import app.models.property_image  # noqa: F401
+import app.models.review  # noqa: F401
+import app.models.wishlist  # noqa: F401
+import app.models.prediction  # noqa: F401
+import app.models.market_sketch  # noqa: F401
+import app.models.job  # noqa: F401
+
+
+# Ordered list of schema steps applied by `flask upgrade-db`.
+# Every step must be idempotent: fresh databases already get the
+# full schema from create_all, older ones get patched here.
+MIGRATIONS = []
+
+
+def migration(fn):
+    MIGRATIONS.append(fn)
+    return fn
+
+
+# -----------------------
+# Helpers
+# -----------------------
+def _has_column(table, column):
+    columns = inspect(db.engine).get_columns(table)
+    return any(c["name"] == column for c in columns)
+
+
+def _add_column(table, column, ddl):
+    if _has_column(table, column):
+        return False
+    db.session.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _has_index(table, name):
+    return any(i["name"] == name for i in inspect(db.engine).get_indexes(table))
+
+
+def _dedupe(table, *columns):
+    # Keep the oldest row of each group so a unique index can be built
+    group = ", ".join(columns)
+    db.session.execute(text(
+        f"DELETE FROM {table} WHERE id NOT IN "
+        f"(SELECT MIN(id) FROM {table} GROUP BY {group})"
+    ))
+
+
+def _create_indexes(model, *names):
+    connection = db.session.connection()
+    for index in model.__table__.indexes:
+        if index.name in names:
+            index.create(bind=connection, checkfirst=True)
+
+
+# -----------------------
+# Steps
+# -----------------------
+@migration
+def add_property_rating_aggregates():
+    added = _add_column("properties", "review_count", "INTEGER NOT NULL DEFAULT 0")
+    added |= _add_column("properties", "rating_sum", "INTEGER NOT NULL DEFAULT 0")
+
+    if added:
+        backfill_rating_aggregates()
+
+
+@migration
+def add_listing_keyset_indexes():
+    from app.models.property import Property
+
+    _create_indexes(
+        Property,
+        "ix_properties_created_at_id",
+        "ix_properties_rent_id"
+    )
+
+
+@migration
+def add_search_and_lookup_indexes():
+    from app.models.property import Property
+    from app.models.property_image import PropertyImage
+    from app.models.review import Review
+    from app.models.wishlist import Wishlist
+
+    _create_indexes(
+        Property,
+        "ix_properties_city_trgm",
+        "ix_properties_locality_trgm",
+        "ix_properties_segment"
+    )
+    _create_indexes(PropertyImage, "ix_property_images_property_id")
+    _create_indexes(Review, "ix_reviews_property_id")
+
+    if not _has_index("wishlist", "ux_wishlist_user_property"):
+        _dedupe("wishlist", "user_id", "property_id")
+        _create_indexes(Wishlist, "ux_wishlist_user_property")
+
+    if not _has_index("reviews", "ux_reviews_user_property"):
+        _dedupe("reviews", "user_id", "property_id")
+        _create_indexes(Review, "ux_reviews_user_property")
+        backfill_rating_aggregates()
+
+
+@migration
+def add_prediction_provenance():
+    from app.models.prediction import Prediction
+
+    _add_column("predictions", "model_version", "VARCHAR(32)")
+    _add_column("predictions", "features_key", "VARCHAR(40)")
+    _create_indexes(Prediction, "ix_predictions_property_id_id")
+
+
+@migration
+def add_image_derivatives():
+    _add_column("property_images", "thumbnail_url", "VARCHAR(300)")
+    _add_column("property_images", "medium_url", "VARCHAR(300)")
+
+
+@migration
+def scope_job_idempotency_to_active():
+    from app.models.job import Job
+
+    if _has_index("jobs", "ux_jobs_active_idempotency_key"):
+        return
+
+    # Drop the table-wide UNIQUE on idempotency_key: finished jobs must
+    # not block the same work from being queued again
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("ALTER TABLE jobs DROP CONSTRAINT IF EXISTS jobs_idempotency_key_key"))
+    else:
+        # SQLite can't drop a column constraint; rebuild the table
+        columns = ", ".join(c.name for c in Job.__table__.columns)
+        db.session.execute(text("ALTER TABLE jobs RENAME TO jobs_old"))
+        db.session.execute(text("DROP INDEX IF EXISTS ix_jobs_status_run_after"))
+        Job.__table__.create(bind=db.session.connection())
+        db.session.execute(text(f"INSERT INTO jobs ({columns}) SELECT {columns} FROM jobs_old"))
+        db.session.execute(text("DROP TABLE jobs_old"))
+
+    _create_indexes(Job, "ux_jobs_active_idempotency_key")
+
+
+@migration
+def require_property_created_at():
+    # A NULL created_at falls out of every keyset page after the first;
+    # undated listings are backfilled as the oldest ones
+    db.session.execute(text(
+        "UPDATE properties SET created_at = "
+        "COALESCE((SELECT MIN(created_at) FROM properties), CURRENT_TIMESTAMP) "
+        "WHERE created_at IS NULL"
+    ))
+
+    # SQLite can't add NOT NULL to an existing column; the model default
+    # keeps new rows dated there
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("ALTER TABLE properties ALTER COLUMN created_at SET NOT NULL"))
+
+
+@migration
+def add_market_sketch_dirty_flag():
+    _add_column("market_sketches", "dirty", "BOOLEAN NOT NULL DEFAULT FALSE")
+
+
+# -----------------------
+# Data backfills
+# -----------------------
+def backfill_rating_aggregates():
+    from app.models.property import Property
+    from app.models.review import Review
+
+    review_count = (
+        db.select(db.func.count(Review.id))
+        .where(Review.property_id == Property.id)
+        .scalar_subquery()
+    )
+    rating_sum = (
+        db.select(db.func.coalesce(db.func.sum(Review.rating), 0))
+        .where(Review.property_id == Property.id)
+        .scalar_subquery()
+    )
+
+    result = db.session.execute(
+        db.update(Property)
+        .values(review_count=review_count, rating_sum=rating_sum)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def upgrade():
+    # Trigram indexes need the extension before any table is created
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        db.session.commit()
+
+    db.create_all()
+
+    for step in MIGRATIONS:
+        step()
+
+    db.session.commit()
@@ -0,0 +1,42 @@
+from datetime import datetime
+from app import db
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Worker claim scan: next runnable jobs in id order
+        db.Index("ix_jobs_status_run_after", "status", "run_after"),
+        # A second enqueue with the same key is a no-op while the first
+        # job is still queued or running
+        db.Index(
+            "ux_jobs_active_idempotency_key",
+            "idempotency_key",
+            unique=True,
+            postgresql_where=db.text("status IN ('queued', 'running')"),
+            sqlite_where=db.text("status IN ('queued', 'running')")
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    name = db.Column(db.String(100), nullable=False)
+
+    # JSON-encoded handler arguments
+    payload = db.Column(db.Text, nullable=False, default="{}")
+
+    idempotency_key = db.Column(db.String(200), nullable=True)
+
+    # queued -> running -> done | failed (running -> queued on retry)
+    status = db.Column(db.String(20), nullable=False, default="queued")
+
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = db.Column(db.DateTime, nullable=True)
+
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
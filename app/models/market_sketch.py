@@ -0,0 +1,32 @@
+from datetime import datetime
+from app import db
+
+
+class MarketSketch(db.Model):
+    __tablename__ = "market_sketches"
+    __table_args__ = (
+        db.Index(
+            "ux_market_sketches_segment",
+            "city", "locality", "bedrooms", "sqft_bucket",
+            unique=True
+        ),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Lower-cased segment key; sqft_bucket = area_sqft // SKETCH_SQFT_BUCKET
+    city = db.Column(db.String(100), nullable=False)
+    locality = db.Column(db.String(150), nullable=False)
+    bedrooms = db.Column(db.Integer, nullable=False)
+    sqft_bucket = db.Column(db.Integer, nullable=False)
+
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    # KLLSketch.to_bytes()
+    data = db.Column(db.LargeBinary, nullable=False)
+
+    # Set when a listing in the segment is edited or deleted; reads
+    # rebuild the sketch from rents until it is refreshed
+    dirty = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
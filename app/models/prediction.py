@@ -3,6 +3,10 @@ from app import db
 
 class Prediction(db.Model):
     __tablename__ = "predictions"
+    __table_args__ = (
+        # Latest prediction per property
+        db.Index("ix_predictions_property_id_id", "property_id", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -14,4 +18,14 @@ class Prediction(db.Model):
 
     is_overpriced = db.Column(db.Boolean, nullable=False)
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    # Which model and which feature values produced predicted_rent
+    model_version = db.Column(db.String(32))
+    features_key = db.Column(db.String(40))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @classmethod
+    def latest_for(cls, property_id):
+        return cls.query.filter_by(
+            property_id=property_id
+        ).order_by(cls.id.desc()).first()
@@ -1,10 +1,37 @@
 from datetime import datetime
 from app import db
 from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import load_only
 from app.models.property_image import PropertyImage
+from app.models.prediction import Prediction
 
 class Property(db.Model):
     __tablename__ = "properties"
+    __table_args__ = (
+        # Keyset pagination orders for the listing
+        db.Index("ix_properties_created_at_id", "created_at", "id"),
+        db.Index("ix_properties_rent_id", "rent", "id"),
+        # ilike('%...%') filters on city/locality (needs pg_trgm)
+        db.Index(
+            "ix_properties_city_trgm",
+            "city",
+            postgresql_using="gin",
+            postgresql_ops={"city": "gin_trgm_ops"}
+        ),
+        db.Index(
+            "ix_properties_locality_trgm",
+            "locality",
+            postgresql_using="gin",
+            postgresql_ops={"locality": "gin_trgm_ops"}
+        ),
+        # Comparable-property lookups in RentEngine (equality on the
+        # normalized city/locality, see RentEngine.comparables_query)
+        db.Index(
+            "ix_properties_segment",
+            "city", "locality", "bedrooms", "area_sqft"
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
@@ -27,7 +54,12 @@ class Property(db.Model):
     # Relationship to owner
     owner = db.relationship("User", backref="properties")
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Non-null: keyset pagination compares (created_at, id)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    # Denormalized review aggregates, kept in step by add_review
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     reviews = db.relationship(
         "Review",
@@ -43,26 +75,104 @@ class Property(db.Model):
         cascade="all, delete-orphan"
     )
 
+    predictions = db.relationship(
+        "Prediction",
+        backref="property",
+        lazy=True,
+        cascade="all, delete-orphan"
+    )
+
     # -----------------------
     # Average Rating
     # -----------------------
     def average_rating(self):
-        if not self.reviews:
+        if not self.review_count:
             return 0
-        return round(
-            sum(r.rating for r in self.reviews) / len(self.reviews),
-            2
+        return round(self.rating_sum / self.review_count, 2)
+
+    @classmethod
+    def average_rating_expression(cls):
+        return func.coalesce(
+            cls.rating_sum * 1.0 / func.nullif(cls.review_count, 0),
+            0
         )
 
     # -----------------------
-    # Serialize
+    # Card Projection
+    # -----------------------
+    @classmethod
+    def thumbnail_expression(cls):
+        return (
+            db.select(
+                db.func.coalesce(
+                    PropertyImage.thumbnail_url,
+                    PropertyImage.image_filename
+                )
+            )
+            .where(PropertyImage.property_id == cls.id)
+            .order_by(PropertyImage.id)
+            .limit(1)
+            .correlate(cls)
+            .scalar_subquery()
+            .label("thumbnail")
+        )
+
+    @classmethod
+    def predicted_rent_expression(cls):
+        return (
+            db.select(Prediction.predicted_rent)
+            .where(Prediction.property_id == cls.id)
+            .order_by(Prediction.id.desc())
+            .limit(1)
+            .correlate(cls)
+            .scalar_subquery()
+            .label("predicted_rent")
+        )
+
+    @classmethod
+    def card_query(cls):
+        # Only the columns a listing card shows, plus the first image and
+        # the latest stored prediction. Rows come back as
+        # (Property, thumbnail, predicted_rent) tuples.
+        return cls.query.options(
+            load_only(
+                cls.id,
+                cls.city,
+                cls.locality,
+                cls.bedrooms,
+                cls.area_sqft,
+                cls.rent,
+                cls.created_at,
+                cls.review_count,
+                cls.rating_sum
+            )
+        ).add_columns(
+            cls.thumbnail_expression(),
+            cls.predicted_rent_expression()
+        )
+
+    def to_card_dict(self, thumbnail=None, market_status=None):
+        return {
+            "id": self.id,
+            "city": self.city,
+            "locality": self.locality,
+            "bedrooms": self.bedrooms,
+            "area_sqft": self.area_sqft,
+            "rent": self.rent,
+            "average_rating": self.average_rating(),
+            "review_count": self.review_count,
+            "thumbnail": thumbnail,
+            # Fairness badge from the last stored analysis, if any
+            "market_status": market_status,
+            # Cards only ever render the first image
+            "images": [thumbnail] if thumbnail else []
+        }
+
     # -----------------------
-        # -----------------------
     # Serialize
     # -----------------------
     def to_dict(self):
 
-
         return {
             "id": self.id,
             "city": self.city,
@@ -77,6 +187,7 @@ class Property(db.Model):
                img.image_filename
                for img in self.images
             ],
+            "image_sets": [img.to_srcset() for img in self.images],
             "reviews": [
                 {
                     "rating": r.rating,
@@ -9,10 +9,24 @@ class PropertyImage(db.Model):
 
     image_filename = db.Column(db.String(300), nullable=False)
 
+    # WebP derivatives, filled in by the background pipeline
+    thumbnail_url = db.Column(db.String(300), nullable=True)
+    medium_url = db.Column(db.String(300), nullable=True)
+
     property_id = db.Column(
         db.Integer,
         db.ForeignKey("properties.id"),
-        nullable=False
+        nullable=False,
+        index=True
     )
 
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_srcset(self):
+        # Falls back to the original until derivatives exist
+        return {
+            "original": self.image_filename,
+            "thumbnail": self.thumbnail_url or self.image_filename,
+            "medium": self.medium_url or self.image_filename,
+            "ready": bool(self.thumbnail_url and self.medium_url)
+        }
@@ -2,10 +2,13 @@ from app import db
 
 class Review(db.Model):
     __tablename__ = "reviews"
+    __table_args__ = (
+        db.Index("ux_reviews_user_property", "user_id", "property_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     rating = db.Column(db.Integer, nullable=False)  # 1-5
     comment = db.Column(db.Text)
 
     user_id = db.Column(db.Integer, db.ForeignKey("users.id"))
-    property_id = db.Column(db.Integer, db.ForeignKey("properties.id"))
\ No newline at end of file
+    property_id = db.Column(db.Integer, db.ForeignKey("properties.id"), index=True)
\ No newline at end of file
@@ -2,6 +2,9 @@ from app import db
 
 class Wishlist(db.Model):
     __tablename__ = "wishlist"
+    __table_args__ = (
+        db.Index("ux_wishlist_user_property", "user_id", "property_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
 
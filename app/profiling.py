@@ -0,0 +1,212 @@
+import hmac
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from flask import abort, current_app, g, jsonify, request, send_from_directory
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_SUFFIX = ".folded"
+
+
+# =========================================================
+# STACK SAMPLER
+# =========================================================
+_labels = {}
+
+
+def _frame_label(code):
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        for root in sorted(sys.path, key=len, reverse=True):
+            if root and path.startswith(root + os.sep):
+                path = path[len(root) + 1:]
+                break
+        # ';' separates frames in the collapsed format
+        label = _labels[code] = f"{code.co_name} ({path}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval` seconds.
+
+    Samples are aggregated as collapsed stacks ("outer;inner count"),
+    the input format for flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name="profiler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# =========================================================
+# STORAGE
+# =========================================================
+def _profile_dir():
+    return current_app.config["PROFILING_DIR"]
+
+
+def _save(sampler, meta):
+    directory = _profile_dir()
+    os.makedirs(directory, exist_ok=True)
+
+    now = time.time()
+    profile_id = (
+        f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}"
+        f"{int(now * 1000) % 1000:03d}-{uuid.uuid4().hex[:6]}"
+    )
+    with open(os.path.join(directory, profile_id + PROFILE_SUFFIX), "w") as f:
+        f.write(sampler.collapsed())
+    with open(os.path.join(directory, profile_id + ".json"), "w") as f:
+        json.dump(dict(meta, id=profile_id, samples=sampler.samples), f)
+
+    _prune(directory, current_app.config["PROFILING_MAX_FILES"])
+    return profile_id
+
+
+def _prune(directory, keep):
+    # Ids start with a timestamp, so name order is age order
+    ids = sorted(name[:-len(PROFILE_SUFFIX)] for name in os.listdir(directory) if name.endswith(PROFILE_SUFFIX))
+    for profile_id in ids[:max(0, len(ids) - keep)]:
+        for suffix in (PROFILE_SUFFIX, ".json"):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+# =========================================================
+# REQUEST HOOKS
+# =========================================================
+def _token_matches(value):
+    token = current_app.config["PROFILING_TOKEN"]
+    return bool(token and value) and hmac.compare_digest(value, token)
+
+
+def _start_profile():
+    if request.endpoint in ("list_profiles", "get_profile"):
+        return
+
+    requested = _token_matches(request.headers.get(PROFILE_HEADER))
+    if not requested and random.random() >= current_app.config["PROFILING_SAMPLE_RATE"]:
+        return
+
+    sampler = StackSampler(threading.get_ident(), current_app.config["PROFILING_INTERVAL_MS"] / 1000)
+    sampler.start()
+
+    g.profiler = sampler
+    g.profile_started = time.perf_counter()
+    g.profile_trigger = "header" if requested else "sample"
+
+
+def _finish_profile(response):
+    sampler = g.pop("profiler", None)
+    if sampler is None:
+        return response
+
+    sampler.stop()
+    elapsed_ms = (time.perf_counter() - g.profile_started) * 1000
+
+    try:
+        profile_id = _save(sampler, {
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "endpoint": request.endpoint,
+            "status": response.status_code,
+            "duration_ms": round(elapsed_ms, 2),
+            "trigger": g.profile_trigger,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        })
+        response.headers["X-Profile-Id"] = profile_id
+    except OSError as e:
+        print("PROFILE SAVE ERROR:", e)
+
+    return response
+
+
+def _abandon_profile(exc):
+    # after_request is skipped on some error paths; never leak a sampler
+    sampler = g.pop("profiler", None)
+    if sampler is not None:
+        sampler.stop()
+
+
+# =========================================================
+# LISTING ENDPOINTS (TOKEN ONLY)
+# =========================================================
+def _require_token():
+    if not _token_matches(request.headers.get(PROFILE_HEADER)):
+        abort(403)
+
+
+def list_profiles():
+    _require_token()
+
+    directory = _profile_dir()
+    profiles = []
+
+    if os.path.isdir(directory):
+        for name in sorted(os.listdir(directory), reverse=True):
+            if name.endswith(".json"):
+                with open(os.path.join(directory, name)) as f:
+                    profiles.append(json.load(f))
+
+    return jsonify({"profiles": profiles}), 200
+
+
+def get_profile(profile_id):
+    _require_token()
+    return send_from_directory(
+        os.path.abspath(_profile_dir()),
+        profile_id + PROFILE_SUFFIX,
+        mimetype="text/plain"
+    )
+
+
+def init_profiling(app):
+    """Opt-in request profiler.
+
+    A request is profiled when it carries X-Profile-Token matching
+    PROFILING_TOKEN, or at random with PROFILING_SAMPLE_RATE. When
+    PROFILING_ENABLED is off nothing is registered, so requests pay
+    nothing for it.
+    """
+    if not app.config["PROFILING_ENABLED"]:
+        return
+
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    app.teardown_request(_abandon_profile)
+
+    app.add_url_rule("/profiles", "list_profiles", list_profiles)
+    app.add_url_rule("/profiles/<profile_id>", "get_profile", get_profile)
@@ -1,12 +1,47 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required
+from app import db
 from app.models.property import Property
-from app.utils.ml_loader import predict_rent
+from app.services.market_sketches import market_sketch
+from app.services.model_registry import registry, RENT_MODEL
+from app.services.rent_engine import RentEngine
+from app.services.prediction_service import (
+    FEATURE_FIELDS,
+    build_market_analysis,
+    failed_analysis,
+    predict_for_property
+)
+from app.utils.ml_loader import predict_rents, prediction_cache_stats
 
 # ✅ DEFINE BLUEPRINT FIRST
 analysis_bp = Blueprint("analysis", __name__, url_prefix="/analysis")
 
 
+# =========================================================
+# BATCH HELPERS
+# =========================================================
+def _parse_feature_row(row):
+
+    if not isinstance(row, dict):
+        raise ValueError("Row must be an object")
+
+    missing = [f for f in FEATURE_FIELDS + ("rent",) if row.get(f) in (None, "")]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+    features = {
+        "city": str(row["city"]).strip().title(),
+        "locality": str(row["locality"]).strip().title(),
+        "bedrooms": int(row["bedrooms"]),
+        "area_sqft": float(row["area_sqft"])
+    }
+
+    return features, float(row["rent"])
+
+
+# =========================================================
+# ANALYZE SINGLE PROPERTY
+# =========================================================
 @analysis_bp.route("/<int:property_id>", methods=["POST"])
 @jwt_required(optional=True)
 def analyze_property(property_id):
@@ -17,56 +52,208 @@ def analyze_property(property_id):
         return jsonify({"error": "Property not found"}), 404
 
     try:
-        predicted = predict_rent(
-            property_obj.city,
-            property_obj.locality,
-            property_obj.bedrooms,
-            property_obj.area_sqft
-        )
+        predicted = predict_for_property(property_obj)
 
         if predicted is None:
             raise Exception("Prediction failed")
 
-        # ✅ ROUND TO NEAREST ₹100
-        predicted = round(float(predicted) / 100) * 100
-
     except Exception as e:
+        db.session.rollback()
         print("PREDICTION ERROR:", e)
         return jsonify({
-            "market_analysis": {
-                "predicted_rent": 0,
-                "difference": 0,
-                "market_status": "Prediction failed",
-                "message": "Unable to estimate market value."
-            }
+            "market_analysis": failed_analysis()
         })
 
-    actual_rent = round(property_obj.rent)
-    difference = actual_rent - predicted
-    abs_diff = abs(difference)
+    return jsonify({
+        "market_analysis": build_market_analysis(property_obj.rent, predicted)
+    })
+
+
+# =========================================================
+# ANALYZE BATCH (PROPERTY IDS AND/OR RAW FEATURE ROWS)
+# =========================================================
+@analysis_bp.route("/batch", methods=["POST"])
+@jwt_required(optional=True)
+def analyze_batch():
+
+    data = request.get_json(silent=True) or {}
+
+    property_ids = data.get("property_ids") or []
+    rows = data.get("rows") or []
+
+    if not isinstance(property_ids, list) or not isinstance(rows, list):
+        return jsonify({"error": "property_ids and rows must be lists"}), 400
+
+    if not property_ids and not rows:
+        return jsonify({"error": "Provide property_ids or rows"}), 400
+
+    limit = current_app.config["ANALYSIS_BATCH_LIMIT"]
+    if len(property_ids) + len(rows) > limit:
+        return jsonify({"error": f"At most {limit} items per batch"}), 400
 
-    if difference > 2000:
-        status = "Overpriced"
-        message = f"₹{abs_diff} higher than market average"
-    elif difference < -2000:
-        status = "Underpriced"
-        message = f"₹{abs_diff} lower than market average"
-    else:
-        status = "Fairly Priced"
-        message = f"₹{abs_diff} close to market average"
+    # Each entry: (result dict, features or None, actual rent)
+    items = []
 
-    lower_bound = round(predicted * 0.9)
-    upper_bound = round(predicted * 1.1)
+    try:
+        ids = [int(pid) for pid in property_ids]
+    except (TypeError, ValueError):
+        return jsonify({"error": "property_ids must be integers"}), 400
+
+    found = {
+        p.id: p
+        for p in Property.query.filter(Property.id.in_(ids)).all()
+    } if ids else {}
+
+    for pid in ids:
+        property_obj = found.get(pid)
+        result = {"property_id": pid}
+
+        if not property_obj:
+            result["error"] = "Property not found"
+            items.append((result, None, None))
+            continue
+
+        features = {f: getattr(property_obj, f) for f in FEATURE_FIELDS}
+        items.append((result, features, property_obj.rent))
+
+    for index, row in enumerate(rows):
+        result = {"index": index}
+
+        try:
+            features, rent = _parse_feature_row(row)
+        except (TypeError, ValueError) as e:
+            result["error"] = str(e)
+            items.append((result, None, None))
+            continue
+
+        items.append((result, features, rent))
+
+    scored = [item for item in items if item[1] is not None]
+
+    try:
+        predictions = predict_rents(
+            [features for _, features, _ in scored]
+        ) if scored else []
+    except Exception as e:
+        print("BATCH PREDICTION ERROR:", e)
+        predictions = None
+
+    for position, (result, _, rent) in enumerate(scored):
+        if predictions is None:
+            result["market_analysis"] = failed_analysis()
+        else:
+            result["market_analysis"] = build_market_analysis(
+                rent,
+                predictions[position]
+            )
 
     return jsonify({
-        "market_analysis": {
-            "predicted_rent": predicted,
-            "difference": difference,
-            "market_status": status,
-            "message": message,
-            "market_range": {
-                "low": lower_bound,
-                "high": upper_bound
-            }
+        "results": [result for result, _, _ in items]
+    }), 200
+
+
+# =========================================================
+# WHAT-IF PRICING (MANY ASKED RENTS, ONE COMPARABLE SET)
+# =========================================================
+@analysis_bp.route("/<int:property_id>/what-if", methods=["POST"])
+@jwt_required(optional=True)
+def what_if(property_id):
+
+    property_obj = db.session.get(Property, property_id)
+
+    if not property_obj:
+        return jsonify({"error": "Property not found"}), 404
+
+    data = request.get_json(silent=True) or {}
+    asked_rents = data.get("asked_rents")
+
+    if not isinstance(asked_rents, list) or not asked_rents:
+        return jsonify({"error": "asked_rents must be a non-empty list"}), 400
+
+    limit = current_app.config["WHAT_IF_LIMIT"]
+    if len(asked_rents) > limit:
+        return jsonify({"error": f"At most {limit} asked rents"}), 400
+
+    try:
+        asked_rents = [float(r) for r in asked_rents]
+    except (TypeError, ValueError):
+        return jsonify({"error": "asked_rents must be numbers"}), 400
+
+    result = RentEngine.analyze_many(
+        property_obj.city,
+        property_obj.locality,
+        property_obj.bedrooms,
+        property_obj.area_sqft,
+        asked_rents
+    )
+
+    scenarios = [
+        {"asked_rent": asked, "benchmark": benchmark}
+        for asked, benchmark in zip(asked_rents, result["benchmarks"])
+    ] if result["benchmarks"] else [
+        {"asked_rent": asked, "benchmark": None} for asked in asked_rents
+    ]
+
+    return jsonify({
+        "scenarios": scenarios,
+        "ml_prediction": result["ml_prediction"]
+    }), 200
+
+
+# =========================================================
+# MARKET PERCENTILES (FROM SEGMENT SKETCHES)
+# =========================================================
+@analysis_bp.route("/market", methods=["GET"])
+def market_percentiles():
+
+    city = request.args.get("city")
+    locality = request.args.get("locality")
+    bedrooms = request.args.get("bedrooms")
+
+    if not city:
+        return jsonify({"error": "city is required"}), 400
+
+    try:
+        bedrooms = int(bedrooms) if bedrooms else None
+    except ValueError:
+        return jsonify({"error": "bedrooms must be an integer"}), 400
+
+    sketch = market_sketch(city, locality, bedrooms)
+
+    if sketch is None or not sketch.count:
+        return jsonify({"error": "No market data for this segment"}), 404
+
+    fractions = [0.1, 0.25, 0.5, 0.75, 0.9]
+    values = sketch.quantiles(fractions)
+
+    return jsonify({
+        "city": city,
+        "locality": locality,
+        "bedrooms": bedrooms,
+        "count": sketch.count,
+        "mean": round(sketch.mean, 2),
+        "min": sketch.min,
+        "max": sketch.max,
+        "percentiles": {
+            f"p{int(f * 100)}": value for f, value in zip(fractions, values)
         }
-    })
\ No newline at end of file
+    }), 200
+
+
+# =========================================================
+# MODEL STATUS
+# =========================================================
+@analysis_bp.route("/model", methods=["GET"])
+def model_status():
+
+    try:
+        loaded = registry.get(RENT_MODEL)
+        model = {"name": loaded.name, "version": loaded.version}
+    except Exception as e:
+        print("MODEL STATUS ERROR:", e)
+        model = None
+
+    return jsonify({
+        "model": model,
+        "prediction_cache": prediction_cache_stats()
+    }), 200
@@ -1,18 +1,37 @@
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from werkzeug.utils import secure_filename
 from sqlalchemy import desc, asc
+from sqlalchemy.exc import IntegrityError
 import os
+import json
+import base64
+import io
+from datetime import datetime
 from app.utils.r2_client import get_r2_client
 import uuid
 from app.extensions import db
 import os
-from app.utils.r2_upload import upload_to_r2
+from app.utils.r2_upload import (
+    upload_many_to_r2,
+    delete_from_r2,
+    delete_keys_from_r2,
+    head_objects,
+    new_property_key,
+    presign_upload,
+    property_key_prefix,
+    public_url
+)
 from app import db
 from app.models.property import Property
 from app.models.user import User
 from app.models.review import Review
 from app.models.wishlist import Wishlist
+from app.services import property_filters, market_sketches, response_cache
+from app.services.image_derivatives import schedule_derivatives
+from app.services.prediction_service import market_status, schedule_prediction
+from app.services.property_import import detect_format, import_listings, normalize_listing
+from app.services.segment_stats import segment_stats, snapshot
 
 property_bp = Blueprint("properties", __name__, url_prefix="/properties")
 
@@ -32,82 +51,271 @@ def create_property():
     if not user or user.role != "renter":
         return jsonify({"error": "Only renters can create properties"}), 403
 
+    uploaded_urls = []
+
     try:
-        city = request.form.get("city")
-        locality = request.form.get("locality")
-
-        city = city.strip().title()
-        locality = locality.strip().title()
-
-        bedrooms = int(request.form.get("bedrooms"))
-        area_sqft = float(request.form.get("area_sqft"))
-        rent = round(float(request.form.get("rent")))
-        description = request.form.get("description", "")
-
-        if not city or not locality:
-            return jsonify({"error": "City and locality required"}), 400
-
-        new_property = Property(
-            city=city,
-            locality=locality,
-            bedrooms=bedrooms,
-            area_sqft=area_sqft,
-            rent=rent,
-            description=description,
-            owner_id=user_id
-        )
+        try:
+            listing = normalize_listing(request.form)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        new_property = Property(**listing, owner_id=user_id)
 
         db.session.add(new_property)
         db.session.flush()
 
-        images = request.files.getlist("images")
-        from app.models.property_image import PropertyImage
+        if current_app.config["MARKET_SKETCHES_ENABLED"]:
+            market_sketches.record_rent(new_property)
 
-        for image in images:
-            if image and image.filename != "":
-                image_url = upload_to_r2(image)
+        images = [
+            image for image in request.files.getlist("images")
+            if image and image.filename != ""
+        ]
+        from app.models.property_image import PropertyImage
 
-                property_image = PropertyImage(
-                    image_filename=image_url,
-                    property_id=new_property.id
-                )
+        # Concurrent; all-or-nothing on the R2 side
+        uploaded_urls = upload_many_to_r2(images)
 
-                db.session.add(property_image)
+        new_images = [
+            PropertyImage(image_filename=image_url, property_id=new_property.id)
+            for image_url in uploaded_urls
+        ]
+        db.session.add_all(new_images)
 
         db.session.commit()
-        return jsonify({"message": "Property created"}), 201
 
     except Exception as e:
         db.session.rollback()
+        # Don't leave orphaned objects behind a rolled-back listing
+        delete_from_r2(uploaded_urls)
         print("CREATE ERROR:", e)
         return jsonify({"error": "Creation failed"}), 500
 
+    # The listing and its images are committed from here on, so a
+    # failing follow-up must not roll back or delete anything
+    try:
+        property_filters.invalidate_filters()
+        response_cache.invalidate()
+        segment_stats.apply_change(after=snapshot(new_property))
+        schedule_derivatives([image.id for image in new_images])
+        schedule_prediction(new_property)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print("CREATE FOLLOW-UP ERROR:", e)
+
+    return jsonify({"message": "Property created"}), 201
+
 # =========================================================
-# GET ALL (PAGINATION + SEARCH + SORT)
+# BULK IMPORT (CSV / JSONL)
 # =========================================================
-@property_bp.route("/all", methods=["GET"])
-@jwt_required(optional=True)
-def get_all_properties():
+@property_bp.route("/import", methods=["POST"])
+@jwt_required()
+def import_properties():
+    user_id = int(get_jwt_identity())
+    user = db.session.get(User, user_id)
 
-    current_user_id = None
-    try:
-        current_user_id = int(get_jwt_identity())
-    except:
-        current_user_id = None
+    if not user or user.role != "renter":
+        return jsonify({"error": "Only renters can create properties"}), 403
+
+    request.max_content_length = current_app.config["BULK_IMPORT_MAX_MB"] * 1024 * 1024
+
+    # Either a multipart "file" field or the raw body
+    upload = request.files.get("file")
+    if upload:
+        # Detach the spooled file so closing the request (which happens
+        # before a streamed response is consumed) doesn't close it
+        stream, upload.stream = upload.stream, io.BytesIO()
+        fmt = detect_format(upload.filename, upload.content_type, request.args.get("format"))
+    else:
+        stream = io.BufferedReader(request.stream)
+        fmt = detect_format(content_type=request.content_type, requested=request.args.get("format"))
+
+    if fmt is None:
+        return jsonify({"error": "Upload a .csv or .jsonl file"}), 400
+
+    chunk_size = current_app.config["BULK_IMPORT_CHUNK_SIZE"]
+
+    @stream_with_context
+    def generate():
+        # One JSON line per committed chunk, then the summary
+        updates = import_listings(stream, fmt, user_id, chunk_size=chunk_size)
+        try:
+            for update in updates:
+                yield json.dumps(update) + "\n"
+        finally:
+            # Runs the import's follow-ups now if the client disconnected
+            updates.close()
+            stream.close()
+
+    return Response(generate(), mimetype="application/x-ndjson")
+
+
+# =========================================================
+# PRESIGNED IMAGE UPLOADS
+# =========================================================
+def _owned_property(property_id):
+    # Returns (property, error response)
+    user_id = int(get_jwt_identity())
+    property_obj = db.session.get(Property, property_id)
+
+    if not property_obj:
+        return None, (jsonify({"error": "Property not found"}), 404)
+
+    if property_obj.owner_id != user_id:
+        return None, (jsonify({"error": "Not authorized"}), 403)
+
+    return property_obj, None
+
+
+@property_bp.route("/<int:property_id>/images/presign", methods=["POST"])
+@jwt_required()
+def presign_images(property_id):
+
+    property_obj, error = _owned_property(property_id)
+    if error:
+        return error
+
+    files = (request.get_json(silent=True) or {}).get("files")
+    max_files = current_app.config["PRESIGNED_UPLOAD_MAX_FILES"]
+
+    if not isinstance(files, list) or not files:
+        return jsonify({"error": "files must be a non-empty list"}), 400
+
+    if len(files) > max_files:
+        return jsonify({"error": f"At most {max_files} files per request"}), 400
+
+    expires_in = current_app.config["PRESIGNED_UPLOAD_EXPIRES"]
+    uploads = []
 
-    city = request.form.get("city")
+    for f in files:
+        if not isinstance(f, dict):
+            return jsonify({"error": "Each file must be an object"}), 400
+
+        filename = f.get("filename") or "image"
+        content_type = f.get("content_type") or ""
+
+        if not isinstance(filename, str) or not isinstance(content_type, str):
+            return jsonify({"error": "filename and content_type must be strings"}), 400
+
+        if not content_type.startswith("image/"):
+            return jsonify({"error": f"{filename} is not an image"}), 400
+
+        object_key = new_property_key(property_obj.id, filename)
+
+        uploads.append({
+            "key": object_key,
+            "upload_url": presign_upload(object_key, content_type, expires_in),
+            "method": "PUT",
+            "headers": {"Content-Type": content_type}
+        })
+
+    return jsonify({"uploads": uploads, "expires_in": expires_in}), 200
+
+
+@property_bp.route("/<int:property_id>/images/finalize", methods=["POST"])
+@jwt_required()
+def finalize_images(property_id):
+
+    property_obj, error = _owned_property(property_id)
+    if error:
+        return error
+
+    keys = (request.get_json(silent=True) or {}).get("keys")
+
+    if not isinstance(keys, list) or not keys:
+        return jsonify({"error": "keys must be a non-empty list"}), 400
+
+    if any(not isinstance(k, str) for k in keys):
+        return jsonify({"error": "keys must be strings"}), 400
+
+    keys = list(dict.fromkeys(keys))
+    prefix = property_key_prefix(property_obj.id)
+
+    if any(not k.startswith(prefix) for k in keys):
+        return jsonify({"error": "Key does not belong to this property"}), 400
+
+    from app.models.property_image import PropertyImage
+
+    # Finalize is safe to retry: keys already recorded are skipped
+    existing = {
+        image.image_filename
+        for image in PropertyImage.query.filter(
+            PropertyImage.property_id == property_obj.id,
+            PropertyImage.image_filename.in_([public_url(k) for k in keys])
+        )
+    }
+    pending = [k for k in keys if public_url(k) not in existing]
+
+    heads = head_objects(pending)
+    max_bytes = current_app.config["PRESIGNED_UPLOAD_MAX_MB"] * 1024 * 1024
+
+    missing = [k for k, head in heads.items() if head is None]
+    if missing:
+        return jsonify({"error": "Uploads not found", "missing": missing}), 400
+
+    rejected = [
+        k for k, head in heads.items()
+        if head["ContentLength"] > max_bytes
+        or not head.get("ContentType", "").startswith("image/")
+    ]
+    if rejected:
+        delete_keys_from_r2(rejected)
+        return jsonify({
+            "error": "Uploads must be images under the size limit",
+            "rejected": rejected
+        }), 400
+
+    new_images = [
+        PropertyImage(image_filename=public_url(k), property_id=property_obj.id)
+        for k in pending
+    ]
+    db.session.add_all(new_images)
+
+    db.session.commit()
+    response_cache.invalidate(property_obj.id)
+    schedule_derivatives([image.id for image in new_images])
+    db.session.commit()
+
+    return jsonify({
+        "message": "Images added",
+        "images": [public_url(k) for k in keys]
+    }), 201
+
+
+# =========================================================
+# LISTING HELPERS
+# =========================================================
+def _wishlisted_ids(user_id, property_ids):
+
+    if not user_id or not property_ids:
+        return set()
+
+    rows = db.session.query(Wishlist.property_id).filter(
+        Wishlist.user_id == user_id,
+        Wishlist.property_id.in_(property_ids)
+    ).all()
+
+    return {row.property_id for row in rows}
+
+
+# Every query parameter the listing reads (filters, sort, paging);
+# the response cache keys on exactly these
+LISTING_PARAMS = (
+    "city", "locality", "bedrooms", "min_price", "max_price",
+    "sort", "page", "per_page", "cursor", "include_total"
+)
+
+
+def _filter_listing(query):
+
+    city = request.args.get("city")
     if city:
       city = city.strip().lower().capitalize()
     locality = request.args.get("locality")
     bedrooms = request.args.get("bedrooms")
     min_price = request.args.get("min_price")
     max_price = request.args.get("max_price")
-    sort = request.args.get("sort")
-
-    page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 9))
-
-    query = Property.query
 
     if city:
         query = query.filter(Property.city.ilike(f"%{city}%"))
@@ -127,34 +335,172 @@ def get_all_properties():
     if max_price:
         query = query.filter(Property.rent <= float(max_price))
 
-    if sort == "low":
-        query = query.order_by(asc(Property.rent))
-    elif sort == "high":
-        query = query.order_by(desc(Property.rent))
-    else:
-        query = query.order_by(desc(Property.created_at))
+    return query
 
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
+def _serialize_cards(rows, current_user_id, wishlisted=None):
+
+    if wishlisted is None:
+        wishlisted = _wishlisted_ids(
+            current_user_id,
+            [row[0].id for row in rows]
+        )
 
     properties_list = []
 
-    for p in pagination.items:
-        property_data = p.to_dict()
+    for p, thumbnail, predicted_rent in rows:
+        status = None
+        if predicted_rent is not None:
+            status = market_status(p.rent, predicted_rent)
+
+        property_data = p.to_card_dict(thumbnail, status)
 
         # 🔥 Inject wishlist flag
-        if current_user_id:
-            exists = Wishlist.query.filter_by(
-                user_id=current_user_id,
-                property_id=p.id
-            ).first()
-            property_data["is_in_wishlist"] = bool(exists)
-        else:
-            property_data["is_in_wishlist"] = False
+        property_data["is_in_wishlist"] = p.id in wishlisted
 
         properties_list.append(property_data)
 
+    return properties_list
+
+
+# =========================================================
+# KEYSET (CURSOR) PAGINATION
+# =========================================================
+# sort -> (column, descending); ties are broken on id in the same
+# direction, matching ix_properties_created_at_id / ix_properties_rent_id
+KEYSET_SORTS = {
+    "newest": (Property.created_at, True),
+    "low": (Property.rent, False),
+    "high": (Property.rent, True)
+}
+
+
+def _encode_cursor(sort_key, value, property_id):
+
+    if isinstance(value, datetime):
+        value = value.isoformat()
+
+    raw = json.dumps([sort_key, value, property_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor, sort_key):
+
+    padded = cursor + "=" * (-len(cursor) % 4)
+    cursor_sort, value, property_id = json.loads(
+        base64.urlsafe_b64decode(padded.encode())
+    )
+
+    if cursor_sort != sort_key:
+        raise ValueError("Cursor was issued for a different sort order")
+
+    if sort_key == "newest":
+        value = datetime.fromisoformat(value)
+
+    return value, int(property_id)
+
+
+def _keyset_page(query, sort, per_page, current_user_id):
+
+    sort_key = sort if sort in ("low", "high") else "newest"
+
+    if sort == "rating":
+        return jsonify({
+            "error": "Cursor pagination is not supported for rating sort"
+        }), 400
+
+    column, descending = KEYSET_SORTS[sort_key]
+    cursor = request.args.get("cursor")
+
+    total_items = None
+    if request.args.get("include_total") == "true":
+        total_items = query.order_by(None).count()
+
+    if cursor:
+        try:
+            value, last_id = _decode_cursor(cursor, sort_key)
+        except (ValueError, TypeError):
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        position = db.tuple_(column, Property.id)
+        if descending:
+            query = query.filter(position < db.tuple_(value, last_id))
+        else:
+            query = query.filter(position > db.tuple_(value, last_id))
+
+    if descending:
+        query = query.order_by(desc(column), desc(Property.id))
+    else:
+        query = query.order_by(asc(column), asc(Property.id))
+
+    # One extra row tells us whether another page exists
+    rows = query.limit(per_page + 1).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1][0]
+        next_cursor = _encode_cursor(
+            sort_key,
+            getattr(last, column.key),
+            last.id
+        )
+
+    response = {
+        "properties": _serialize_cards(rows, current_user_id),
+        "next_cursor": next_cursor,
+        "has_more": has_more
+    }
+
+    if total_items is not None:
+        response["total_items"] = total_items
+
+    return jsonify(response), 200
+
+
+# =========================================================
+# GET ALL (PAGINATION + SEARCH + SORT)
+# =========================================================
+# Pass ?cursor= (empty for the first page) to switch to keyset
+# pagination; otherwise classic page/per_page with totals.
+@property_bp.route("/all", methods=["GET"])
+@jwt_required(optional=True)
+@response_cache.cached_response(lambda: [response_cache.LISTING], params=LISTING_PARAMS)
+def get_all_properties():
+
+    current_user_id = None
+    try:
+        current_user_id = int(get_jwt_identity())
+    except:
+        current_user_id = None
+
+    sort = request.args.get("sort")
+
+    page = int(request.args.get("page", 1))
+    per_page = int(request.args.get("per_page", 9))
+
+    query = _filter_listing(Property.card_query())
+
+    if "cursor" in request.args:
+        return _keyset_page(query, sort, per_page, current_user_id)
+
+    if sort == "low":
+        query = query.order_by(asc(Property.rent))
+    elif sort == "high":
+        query = query.order_by(desc(Property.rent))
+    elif sort == "rating":
+        query = query.order_by(
+            desc(Property.average_rating_expression()),
+            desc(Property.review_count)
+        )
+    else:
+        query = query.order_by(desc(Property.created_at))
+
+    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+
     return jsonify({
-        "properties": properties_list,
+        "properties": _serialize_cards(pagination.items, current_user_id),
         "current_page": pagination.page,
         "total_pages": pagination.pages,
         "total_items": pagination.total
@@ -162,26 +508,20 @@ def get_all_properties():
 @property_bp.route("/filters", methods=["GET"])
 def get_filters():
 
-    properties = Property.query.all()
-    city_map = {}
-
-    for p in properties:
-        if p.city not in city_map:
-            city_map[p.city] = set()
-        city_map[p.city].add(p.locality)
+    payload, etag = property_filters.get_filters()
 
-    # Convert sets to lists
-    for city in city_map:
-        city_map[city] = list(city_map[city])
+    response = jsonify(payload)
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
 
-    return jsonify({
-        "cities": city_map
-    }), 200
+    # Answers 304 when If-None-Match matches
+    return response.make_conditional(request)
 
 # =========================================================
 # GET SINGLE PROPERTY
 # =========================================================
 @property_bp.route("/<int:property_id>", methods=["GET"])
+@response_cache.cached_response(lambda property_id: [response_cache.property_scope(property_id)])
 def get_property(property_id):
 
     property_obj = db.session.get(Property, property_id)
@@ -225,6 +565,7 @@ def update_property(property_id):
         return jsonify({"error": "Not authorized"}), 403
 
     data = request.get_json()
+    before = snapshot(property_obj)
 
     try:
         if data.get("city"):
@@ -236,6 +577,17 @@ def update_property(property_id):
         property_obj.rent = round(float(data.get("rent", property_obj.rent)))
         property_obj.description = data.get("description", property_obj.description)
 
+        sketches_enabled = current_app.config["MARKET_SKETCHES_ENABLED"]
+        if sketches_enabled:
+            market_sketches.record_change(before=before, after=snapshot(property_obj))
+
+        db.session.commit()
+        property_filters.invalidate_filters()
+        response_cache.invalidate(property_obj.id)
+        segment_stats.apply_change(before=before, after=snapshot(property_obj))
+        schedule_prediction(property_obj)
+        if sketches_enabled:
+            market_sketches.schedule_refresh()
         db.session.commit()
 
         return jsonify({"message": "Updated successfully"}), 200
@@ -262,8 +614,20 @@ def delete_property(property_id):
     if property_obj.owner_id != user_id:
         return jsonify({"error": "Not authorized"}), 403
 
+    before = snapshot(property_obj)
+    sketches_enabled = current_app.config["MARKET_SKETCHES_ENABLED"]
+
     db.session.delete(property_obj)
+    if sketches_enabled:
+        market_sketches.record_change(before=before)
     db.session.commit()
+    property_filters.invalidate_filters()
+    response_cache.invalidate(property_id)
+    segment_stats.apply_change(before=before)
+
+    if sketches_enabled:
+        market_sketches.schedule_refresh()
+        db.session.commit()
 
     return jsonify({"message": "Deleted successfully"}), 200
 
@@ -314,7 +678,27 @@ def add_review(property_id):
     )
 
     db.session.add(review)
-    db.session.commit()
+
+    try:
+        # Flush first so a duplicate trips ux_reviews_user_property here,
+        # not in the autoflush of the update below
+        db.session.flush()
+
+        # Keep the rating aggregates in the same transaction as the review
+        Property.query.filter_by(id=property_id).update({
+            Property.review_count: Property.review_count + 1,
+            Property.rating_sum: Property.rating_sum + rating
+        }, synchronize_session=False)
+
+        db.session.commit()
+    except IntegrityError:
+        # Lost a race against a concurrent review from the same user
+        db.session.rollback()
+        return jsonify({
+            "error": "You have already reviewed this property."
+        }), 400
+
+    response_cache.invalidate(property_id)
 
     return jsonify({"message": "Review added"}), 201
 
@@ -342,7 +726,12 @@ def add_to_wishlist(property_id):
     )
 
     db.session.add(wishlist)
-    db.session.commit()
+
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"message": "Already added"}), 200
 
     return jsonify({"message": "Added to wishlist"}), 201
 @property_bp.route("/<int:property_id>/wishlist", methods=["DELETE"])
@@ -373,15 +762,17 @@ def get_wishlist():
 
     user_id = int(get_jwt_identity())
 
-    wishlist_items = Wishlist.query.filter_by(
-        user_id=user_id
-    ).all()
-
-    properties = []
-
-    for item in wishlist_items:
-        property_obj = db.session.get(Property, item.property_id)
-        if property_obj:
-            properties.append(property_obj.to_dict())
+    rows = Property.card_query().join(
+        Wishlist,
+        Wishlist.property_id == Property.id
+    ).filter(
+        Wishlist.user_id == user_id
+    ).order_by(Wishlist.id).all()
+
+    properties = _serialize_cards(
+        rows,
+        user_id,
+        wishlisted={row[0].id for row in rows}
+    )
 
     return jsonify(properties), 200
\ No newline at end of file
@@ -0,0 +1,189 @@
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+
+class UnsupportedPipelineError(Exception):
+    pass
+
+
+# Rows per vectorized pass; bounds the (trees x rows) node matrix
+CHUNK_SIZE = 4096
+
+
+def _is_passthrough(transformer):
+    if isinstance(transformer, str):
+        return transformer == "passthrough"
+    # ColumnTransformer stores fitted "passthrough" as an identity
+    # FunctionTransformer
+    return isinstance(transformer, FunctionTransformer) and transformer.func is None
+
+
+class CompiledRentModel:
+    """The train_model.py pipeline flattened into plain NumPy arrays.
+
+    One-hot columns become category -> column index maps, and every tree
+    of the forest is packed into shared node arrays (leaves loop back to
+    themselves), so a batch is evaluated as max_depth rounds of fancy
+    indexing with no pandas or sklearn validation in the way.
+
+    Matches pipeline.predict bit for bit when the forest runs with
+    n_jobs=1: features are rounded to float32 like sklearn's trees do,
+    and per-tree outputs are summed in estimator order before dividing.
+    """
+
+    def __init__(self, columns, n_features, children, feature, threshold, value, roots, max_depth):
+        self.columns = columns
+        self.n_features = n_features
+        # children[2 * node] is the right child, children[2 * node + 1] the left
+        self.children = children
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+
+    # --------------------------------------------------
+    # COMPILE
+    # --------------------------------------------------
+    @classmethod
+    def from_pipeline(cls, pipeline):
+
+        preprocessor = pipeline.steps[0][1]
+        forest = pipeline.steps[-1][1]
+
+        if len(pipeline.steps) != 2 or not isinstance(preprocessor, ColumnTransformer):
+            raise UnsupportedPipelineError("Expected ColumnTransformer -> forest")
+
+        if not isinstance(forest, RandomForestRegressor) or forest.n_outputs_ != 1:
+            raise UnsupportedPipelineError("Expected a single-output RandomForestRegressor")
+
+        # input column -> ("onehot", {category: output index}, unknown policy)
+        #               or ("numeric", output index)
+        columns = {}
+        position = 0
+
+        for name, transformer, input_columns in preprocessor.transformers_:
+            if transformer == "drop":
+                continue
+
+            if isinstance(transformer, OneHotEncoder):
+                if transformer.drop is not None or getattr(transformer, "infrequent_categories_", None):
+                    raise UnsupportedPipelineError(f"Unsupported OneHotEncoder options in '{name}'")
+
+                for column, categories in zip(input_columns, transformer.categories_):
+                    mapping = {str(c): position + i for i, c in enumerate(categories)}
+                    columns[column] = ("onehot", mapping, transformer.handle_unknown)
+                    position += len(categories)
+
+            elif _is_passthrough(transformer):
+                for column in input_columns:
+                    columns[column] = ("numeric", position)
+                    position += 1
+
+            else:
+                raise UnsupportedPipelineError(f"Unsupported transformer '{name}'")
+
+        if position != forest.n_features_in_:
+            raise UnsupportedPipelineError(
+                f"Encoded width {position} != forest input width {forest.n_features_in_}"
+            )
+
+        children, features, thresholds, values, roots = [], [], [], [], []
+        offset = 0
+
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            left = np.where(is_leaf, nodes, tree.children_left) + offset
+            right = np.where(is_leaf, nodes, tree.children_right) + offset
+            children.append(np.stack([right, left], axis=1).ravel())
+            features.append(np.where(is_leaf, 0, tree.feature))
+            # x <= inf always holds, so a leaf keeps pointing at itself
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+            values.append(tree.value[:, 0, 0])
+            roots.append(offset)
+
+            offset += tree.node_count
+
+        return cls(
+            columns=columns,
+            n_features=position,
+            children=np.concatenate(children).astype(np.intp),
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.array(roots, dtype=np.intp),
+            max_depth=max(e.tree_.max_depth for e in forest.estimators_)
+        )
+
+    # --------------------------------------------------
+    # ENCODE
+    # --------------------------------------------------
+    def encode(self, data):
+        # data: {column name: sequence of values}, all the same length
+        n_rows = len(next(iter(data.values())))
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+
+        for column, spec in self.columns.items():
+            values = data[column]
+
+            if spec[0] == "numeric":
+                X[:, spec[1]] = np.asarray(values, dtype=np.float32)
+                continue
+
+            _, mapping, handle_unknown = spec
+            for row, category in enumerate(values):
+                index = mapping.get(str(category))
+                if index is not None:
+                    X[row, index] = 1.0
+                elif handle_unknown == "error":
+                    raise ValueError(f"Unknown category {category!r} for {column}")
+
+        return X
+
+    # --------------------------------------------------
+    # PREDICT
+    # --------------------------------------------------
+    def predict(self, data):
+        X = self.encode(data)
+        out = np.empty(X.shape[0], dtype=np.float64)
+
+        for start in range(0, X.shape[0], CHUNK_SIZE):
+            out[start:start + CHUNK_SIZE] = self._predict_encoded(
+                X[start:start + CHUNK_SIZE]
+            )
+
+        return out
+
+    def _predict_encoded(self, X):
+        n_rows, n_features = X.shape
+        # float32 -> float64 is exact, so comparisons match sklearn's
+        flat = X.ravel().astype(np.float64)
+        row_base = np.arange(n_rows) * n_features
+        nodes = np.repeat(self.roots[:, None], n_rows, axis=1)
+
+        for _ in range(self.max_depth):
+            go_left = flat[row_base + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+
+        leaf_values = self.value[nodes]
+
+        # Same accumulation order as RandomForestRegressor.predict
+        total = np.zeros(n_rows, dtype=np.float64)
+        for tree_values in leaf_values:
+            total += tree_values
+        total /= len(self.roots)
+
+        return total
+
+
+def compile_pipeline(pipeline):
+    try:
+        return CompiledRentModel.from_pipeline(pipeline)
+    except UnsupportedPipelineError as e:
+        print("MODEL COMPILE SKIPPED:", e)
+        return None
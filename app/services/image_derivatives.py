@@ -0,0 +1,115 @@
+import io
+import os
+from flask import current_app
+from PIL import Image, ImageOps
+from app import db
+from app.models.property_image import PropertyImage
+from app.services import response_cache
+from app.services.jobs import enqueue, job_handler
+from app.utils.r2_client import get_r2_client
+from app.utils.r2_upload import key_from_url, public_url
+
+# name -> (PropertyImage column, longest edge in px)
+DERIVATIVES = {
+    "thumbnail": ("thumbnail_url", 320),
+    "medium": ("medium_url", 1024),
+}
+WEBP_QUALITY = int(os.environ.get("IMAGE_WEBP_QUALITY", 80))
+
+
+def derivative_key(object_key, name):
+    # rentwise-images/12/abc-photo.jpg -> rentwise-images/12/abc-photo.thumbnail.webp
+    stem = object_key.rsplit(".", 1)[0] if "." in object_key.rsplit("/", 1)[-1] else object_key
+    return f"{stem}.{name}.webp"
+
+
+def _render_webp(image, max_edge):
+    variant = image.copy()
+    variant.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    variant.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    buffer.seek(0)
+    return buffer
+
+
+def generate_derivatives(image_id):
+    """Render and store every missing derivative for one PropertyImage.
+
+    Returns True when the row ends up with all derivatives recorded.
+    """
+    image_row = db.session.get(PropertyImage, image_id)
+    if image_row is None:
+        return False
+
+    object_key = key_from_url(image_row.image_filename)
+    if object_key is None:
+        # Not one of ours (e.g. seeded external URL)
+        return False
+
+    missing = {
+        name: spec for name, spec in DERIVATIVES.items()
+        if getattr(image_row, spec[0]) is None
+    }
+    if not missing:
+        return True
+
+    r2 = get_r2_client()
+    bucket = os.environ.get("R2_BUCKET_NAME")
+
+    original = r2.get_object(Bucket=bucket, Key=object_key)["Body"]
+    with Image.open(io.BytesIO(original.read())) as source:
+        source = ImageOps.exif_transpose(source)
+        if source.mode not in ("RGB", "RGBA"):
+            source = source.convert("RGBA" if "A" in source.getbands() else "RGB")
+
+        for name, (column, max_edge) in missing.items():
+            variant_key = derivative_key(object_key, name)
+
+            r2.upload_fileobj(
+                _render_webp(source, max_edge),
+                bucket,
+                variant_key,
+                ExtraArgs={
+                    "ContentType": "image/webp",
+                    "CacheControl": "public, max-age=31536000, immutable"
+                }
+            )
+            setattr(image_row, column, public_url(variant_key))
+
+    db.session.commit()
+    # Cards and the detail view switch to the new thumbnail
+    response_cache.invalidate(image_row.property_id)
+    return True
+
+
+@job_handler("image_derivatives")
+def _derivatives_job(image_id):
+    generate_derivatives(image_id)
+
+
+def schedule_derivatives(image_ids):
+    # Call after the rows are committed, then commit again so the
+    # database job backend queues the jobs
+    if not current_app.config["IMAGE_DERIVATIVES_ENABLED"]:
+        return
+
+    for image_id in image_ids:
+        enqueue(
+            "image_derivatives",
+            idempotency_key=f"image-derivatives:{image_id}",
+            image_id=image_id
+        )
+
+
+def pending_image_ids():
+    return db.session.scalars(
+        db.select(PropertyImage.id)
+        .where(
+            db.or_(
+                PropertyImage.thumbnail_url.is_(None),
+                PropertyImage.medium_url.is_(None)
+            )
+        )
+        .order_by(PropertyImage.id)
+    ).all()
@@ -0,0 +1,352 @@
+import json
+import signal
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy.exc import IntegrityError
+from app import db
+from app.models.job import Job
+
+# name -> handler(**payload)
+HANDLERS = {}
+
+# Modules whose import registers handlers
+HANDLER_MODULES = (
+    "app.services.image_derivatives",
+    "app.services.market_sketches",
+    "app.services.prediction_service",
+)
+
+
+def job_handler(name):
+    def register(fn):
+        HANDLERS[name] = fn
+        return fn
+    return register
+
+
+# =========================================================
+# METRICS
+# =========================================================
+class JobMetrics:
+
+    EVENTS = ("enqueued", "deduplicated", "succeeded", "retried", "failed")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: dict.fromkeys(self.EVENTS, 0))
+        self._seconds = defaultdict(float)
+
+    def record(self, name, event, seconds=None):
+        with self._lock:
+            self._counts[name][event] += 1
+            if seconds is not None:
+                self._seconds[name] += seconds
+
+    def stats(self):
+        with self._lock:
+            return {
+                name: {
+                    **counts,
+                    "run_seconds": round(self._seconds[name], 3)
+                }
+                for name, counts in self._counts.items()
+            }
+
+
+metrics = JobMetrics()
+
+
+def execute(name, payload):
+    # Runs one job inside the current app context; re-raises on failure
+    handler = HANDLERS.get(name)
+    if handler is None:
+        raise LookupError(f"No handler registered for job {name!r}")
+
+    started = time.perf_counter()
+    try:
+        handler(**payload)
+    except Exception:
+        db.session.rollback()
+        raise
+
+    metrics.record(name, "succeeded", time.perf_counter() - started)
+
+
+def _retry_delay(base, attempt):
+    # 1x, 2x, 4x ... the configured delay
+    return base * (2 ** (attempt - 1))
+
+
+# =========================================================
+# IN-PROCESS BACKEND (DEV / SINGLE INSTANCE)
+# =========================================================
+class ThreadPoolBackend:
+    """Runs jobs on a small pool in this process.
+
+    Jobs are lost on restart. An idempotency key only dedupes against
+    jobs still queued or running in this process.
+    """
+
+    name = "thread"
+
+    def __init__(self, app):
+        self.app = app
+        self.max_attempts = app.config["JOB_MAX_ATTEMPTS"]
+        self.retry_delay = app.config["JOB_RETRY_DELAY"]
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=app.config["JOB_WORKERS"],
+            thread_name_prefix="jobs"
+        )
+        # Idempotency keys of jobs queued or running (retries included)
+        self._active = set()
+        self._lock = threading.Lock()
+
+    def enqueue(self, name, payload, idempotency_key=None, max_attempts=None):
+        if idempotency_key is not None:
+            with self._lock:
+                if idempotency_key in self._active:
+                    metrics.record(name, "deduplicated")
+                    return False
+                self._active.add(idempotency_key)
+
+        metrics.record(name, "enqueued")
+        self._executor.submit(
+            self._run, name, payload, idempotency_key, 1, max_attempts or self.max_attempts
+        )
+        return True
+
+    def _release(self, idempotency_key):
+        with self._lock:
+            self._active.discard(idempotency_key)
+
+    def _run(self, name, payload, idempotency_key, attempt, max_attempts):
+        with self.app.app_context():
+            try:
+                execute(name, payload)
+                self._release(idempotency_key)
+                return
+            except Exception as e:
+                error = e
+
+        if attempt >= max_attempts:
+            self._release(idempotency_key)
+            metrics.record(name, "failed")
+            print("JOB FAILED:", name, payload, error)
+            return
+
+        metrics.record(name, "retried")
+        timer = threading.Timer(
+            _retry_delay(self.retry_delay, attempt),
+            self._executor.submit,
+            (self._run, name, payload, idempotency_key, attempt + 1, max_attempts)
+        )
+        timer.daemon = True
+        timer.start()
+
+    def queue_stats(self):
+        return {}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+# =========================================================
+# POSTGRES TABLE BACKEND (PRODUCTION)
+# =========================================================
+class DatabaseBackend:
+    """Queues jobs as rows in the jobs table.
+
+    worker.py claims runnable rows with SELECT ... FOR UPDATE SKIP
+    LOCKED, so any number of workers can poll the same table without
+    handing one job to two of them. A job whose worker died is
+    reclaimed once it has been running for JOB_VISIBILITY_TIMEOUT.
+
+    Idempotency keys are unique among queued and running rows only
+    (ux_jobs_active_idempotency_key), so a finished job never blocks
+    the same work from being queued again.
+    """
+
+    name = "database"
+
+    def __init__(self, app):
+        self.app = app
+        self.max_attempts = app.config["JOB_MAX_ATTEMPTS"]
+        self.retry_delay = app.config["JOB_RETRY_DELAY"]
+        self.visibility_timeout = app.config["JOB_VISIBILITY_TIMEOUT"]
+
+    def enqueue(self, name, payload, idempotency_key=None, max_attempts=None):
+        # Only flushes: the job is queued when the caller commits, in the
+        # same transaction as the caller's own writes
+        try:
+            with db.session.begin_nested():
+                db.session.add(Job(
+                    name=name,
+                    payload=json.dumps(payload),
+                    idempotency_key=idempotency_key,
+                    max_attempts=max_attempts or self.max_attempts,
+                    run_after=datetime.utcnow()
+                ))
+        except IntegrityError:
+            metrics.record(name, "deduplicated")
+            return False
+
+        metrics.record(name, "enqueued")
+        return True
+
+    def claim(self, limit):
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=self.visibility_timeout)
+
+        rows = db.session.scalars(
+            db.select(Job)
+            .where(
+                db.or_(
+                    db.and_(Job.status == "queued", Job.run_after <= now),
+                    db.and_(Job.status == "running", Job.locked_at < stale)
+                )
+            )
+            .order_by(Job.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).all()
+
+        claimed = []
+        for row in rows:
+            if row.status == "running" and row.attempts >= row.max_attempts:
+                row.status = "failed"
+                row.last_error = "Timed out"
+                row.finished_at = now
+                metrics.record(row.name, "failed")
+                continue
+
+            row.status = "running"
+            row.locked_at = now
+            row.attempts += 1
+            claimed.append((row.id, row.name, json.loads(row.payload), row.attempts, row.max_attempts))
+
+        db.session.commit()
+        return claimed
+
+    def _finish(self, job_id, **values):
+        db.session.execute(
+            db.update(Job).where(Job.id == job_id).values(locked_at=None, **values)
+        )
+        db.session.commit()
+
+    def run_once(self, limit):
+        # Claims and runs up to `limit` jobs; returns how many were claimed
+        claimed = self.claim(limit)
+
+        for job_id, name, payload, attempt, max_attempts in claimed:
+            try:
+                execute(name, payload)
+            except Exception as e:
+                error = str(e)[:1000]
+
+                if attempt >= max_attempts:
+                    metrics.record(name, "failed")
+                    print("JOB FAILED:", job_id, name, e)
+                    self._finish(job_id, status="failed", last_error=error, finished_at=datetime.utcnow())
+                else:
+                    metrics.record(name, "retried")
+                    self._finish(
+                        job_id,
+                        status="queued",
+                        last_error=error,
+                        run_after=datetime.utcnow() + timedelta(
+                            seconds=_retry_delay(self.retry_delay, attempt)
+                        )
+                    )
+                continue
+
+            self._finish(job_id, status="done", finished_at=datetime.utcnow())
+
+        return len(claimed)
+
+    def queue_stats(self):
+        return dict(
+            db.session.execute(
+                db.select(Job.status, db.func.count(Job.id)).group_by(Job.status)
+            ).all()
+        )
+
+    def shutdown(self, wait=True):
+        pass
+
+
+BACKENDS = {
+    ThreadPoolBackend.name: ThreadPoolBackend,
+    DatabaseBackend.name: DatabaseBackend,
+}
+
+
+# =========================================================
+# APP WIRING
+# =========================================================
+def init_jobs(app):
+    import importlib
+
+    for module in HANDLER_MODULES:
+        importlib.import_module(module)
+
+    backend = app.config["JOB_BACKEND"]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown JOB_BACKEND {backend!r}")
+
+    app.extensions["jobs"] = BACKENDS[backend](app)
+
+
+def enqueue(name, idempotency_key=None, max_attempts=None, **payload):
+    # With the database backend the job is part of the current
+    # transaction; callers commit after enqueueing
+    if name not in HANDLERS:
+        raise LookupError(f"No handler registered for job {name!r}")
+
+    return current_app.extensions["jobs"].enqueue(
+        name, payload, idempotency_key=idempotency_key, max_attempts=max_attempts
+    )
+
+
+def job_stats():
+    backend = current_app.extensions["jobs"]
+    return {
+        "backend": backend.name,
+        "jobs": metrics.stats(),
+        "queue": backend.queue_stats()
+    }
+
+
+def run_worker(app):
+    # Polls the jobs table until SIGTERM / SIGINT
+    backend = DatabaseBackend(app)
+    poll_interval = app.config["JOB_POLL_INTERVAL"]
+    batch_size = app.config["JOB_BATCH_SIZE"]
+
+    stopping = threading.Event()
+
+    def stop(signum, frame):
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"Job worker started (handlers: {', '.join(sorted(HANDLERS))})")
+
+    with app.app_context():
+        while not stopping.is_set():
+            try:
+                claimed = backend.run_once(batch_size)
+            except Exception as e:
+                db.session.rollback()
+                print("WORKER ERROR:", e)
+                claimed = 0
+
+            if claimed < batch_size:
+                stopping.wait(poll_interval)
+
+    print("Job worker stopped")
@@ -0,0 +1,29 @@
+# Synthetic market used to train the rent model (train_model.py) and to
+# seed realistically priced listings (seed_data.py). Keep the two in
+# step: listings seeded from a different table would all look mispriced.
+
+# city -> base rent per sqft and per-locality multipliers
+CITY_CONFIG = {
+    "Hyderabad": {"base_rate": 28, "localities": {"Madhapur": 1.35, "Gachibowli": 1.40, "Kondapur": 1.25}},
+    "Chennai": {"base_rate": 26, "localities": {"T Nagar": 1.35, "Adyar": 1.30, "Velachery": 1.20}},
+    "Bengaluru": {"base_rate": 32, "localities": {"Whitefield": 1.30, "Koramangala": 1.45, "Indiranagar": 1.50}},
+    "Mumbai": {"base_rate": 55, "localities": {"Bandra": 1.50, "Andheri": 1.30, "Powai": 1.25}},
+    "Pune": {"base_rate": 30, "localities": {"Hinjewadi": 1.30, "Kothrud": 1.20, "Baner": 1.30}},
+    "Vijayawada": {"base_rate": 20, "localities": {"Benz Circle": 1.30, "Governorpet": 1.20}},
+    "Guntur": {"base_rate": 16, "localities": {"Brodipet": 1.25, "Arundelpet": 1.20}}
+}
+
+BEDROOM_RANGE = (1, 5)          # [low, high)
+AREA_SQFT_RANGE = (450, 2500)   # [low, high)
+BEDROOM_PREMIUM = 2000
+RENT_NOISE = (-3000, 3000)      # [low, high)
+MIN_RENT = 5000
+
+
+def segments():
+    # Flattened (city, locality, rent per sqft) rows
+    return [
+        (city, locality, config["base_rate"] * multiplier)
+        for city, config in CITY_CONFIG.items()
+        for locality, multiplier in config["localities"].items()
+    ]
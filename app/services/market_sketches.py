@@ -0,0 +1,243 @@
+from app import db
+from app.models.market_sketch import MarketSketch
+from app.models.property import Property
+from app.services.jobs import enqueue, job_handler
+from app.services.quantile_sketch import KLLSketch
+
+# Width of the area buckets rents are sketched in. A +/-15% comparables
+# band is answered by merging every bucket it touches, so band edges
+# are widened by up to one bucket on each side.
+SKETCH_SQFT_BUCKET = 100
+
+
+def sqft_bucket(area_sqft):
+    return int(area_sqft // SKETCH_SQFT_BUCKET)
+
+
+def _segment(city, locality, bedrooms, area_sqft):
+    return (
+        city.strip().lower(),
+        locality.strip().lower(),
+        int(bedrooms),
+        sqft_bucket(area_sqft)
+    )
+
+
+def _segment_filter(row):
+    # Properties store city/locality title-cased (see
+    # RentEngine.comparables_query), so this can use ix_properties_segment
+    low = row.sqft_bucket * SKETCH_SQFT_BUCKET
+    return (
+        Property.city == row.city.title(),
+        Property.locality == row.locality.title(),
+        Property.bedrooms == row.bedrooms,
+        Property.area_sqft >= low,
+        Property.area_sqft < low + SKETCH_SQFT_BUCKET
+    )
+
+
+def _segment_rents(row):
+    return db.session.execute(
+        db.select(Property.rent).where(*_segment_filter(row))
+    ).scalars().all()
+
+
+def _row_sketch(row):
+    # A dirty row no longer matches its segment; answer from the rents
+    # until refresh_stale_sketches writes it back
+    if row.dirty:
+        sketch = KLLSketch()
+        sketch.update_many(_segment_rents(row))
+        return sketch
+    return KLLSketch.from_bytes(row.data)
+
+
+def _merge(rows):
+    merged = None
+    for row in rows:
+        sketch = _row_sketch(row)
+        merged = sketch if merged is None else merged.merge(sketch)
+    return merged
+
+
+# =========================================================
+# BUILD / MAINTAIN
+# =========================================================
+def rebuild_market_sketches(chunk_size=5000):
+    # Streams the rent columns, so memory stays at one sketch per segment
+    sketches = {}
+
+    rows = db.session.execute(
+        db.select(
+            Property.city,
+            Property.locality,
+            Property.bedrooms,
+            Property.area_sqft,
+            Property.rent
+        ).execution_options(yield_per=chunk_size)
+    )
+
+    for city, locality, bedrooms, area_sqft, rent in rows:
+        key = _segment(city, locality, bedrooms, area_sqft)
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = KLLSketch()
+        sketch.update(rent)
+
+    db.session.query(MarketSketch).delete()
+
+    db.session.add_all([
+        MarketSketch(
+            city=city,
+            locality=locality,
+            bedrooms=bedrooms,
+            sqft_bucket=bucket,
+            count=sketch.count,
+            data=sketch.to_bytes()
+        )
+        for (city, locality, bedrooms, bucket), sketch in sketches.items()
+    ])
+
+    db.session.commit()
+
+    return len(sketches)
+
+
+def record_rent(property_obj):
+    # Adds a new listing to its segment sketch in the caller's
+    # transaction. Sketches cannot forget values; edits and deletes go
+    # through record_change instead.
+    record_rents([(
+        property_obj.city,
+        property_obj.locality,
+        property_obj.bedrooms,
+        property_obj.area_sqft,
+        property_obj.rent
+    )])
+
+
+def record_rents(rows):
+    # Batched record_rent for (city, locality, bedrooms, area_sqft, rent)
+    # tuples: one sketch read/write per touched segment
+    by_segment = {}
+    for city, locality, bedrooms, area_sqft, rent in rows:
+        by_segment.setdefault(
+            _segment(city, locality, bedrooms, area_sqft), []
+        ).append(rent)
+
+    for (city, locality, bedrooms, bucket), rents in by_segment.items():
+        row = MarketSketch.query.filter_by(
+            city=city,
+            locality=locality,
+            bedrooms=bedrooms,
+            sqft_bucket=bucket
+        ).with_for_update().first()
+
+        if row is None:
+            sketch = KLLSketch()
+            row = MarketSketch(
+                city=city,
+                locality=locality,
+                bedrooms=bedrooms,
+                sqft_bucket=bucket
+            )
+            db.session.add(row)
+        else:
+            sketch = KLLSketch.from_bytes(row.data)
+
+        sketch.update_many(rents)
+        row.count = sketch.count
+        row.data = sketch.to_bytes()
+
+
+def _mark_dirty(city, locality, bedrooms, area_sqft):
+    city, locality, bedrooms, bucket = _segment(city, locality, bedrooms, area_sqft)
+    result = db.session.execute(
+        db.update(MarketSketch)
+        .where(
+            MarketSketch.city == city,
+            MarketSketch.locality == locality,
+            MarketSketch.bedrooms == bedrooms,
+            MarketSketch.sqft_bucket == bucket
+        )
+        .values(dirty=True)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def record_change(before=None, after=None):
+    # before/after: segment_stats.snapshot() tuples, None for a delete.
+    # Marks the touched segments dirty in the caller's transaction; call
+    # schedule_refresh once that has committed.
+    if before is not None:
+        _mark_dirty(*before[:4])
+
+    if after is not None and not _mark_dirty(*after[:4]):
+        # First listing in this segment: nothing to forget
+        record_rents([after])
+
+
+def schedule_refresh():
+    # The key only dedupes in-flight jobs; dirty rows are answered from
+    # the rents table until a refresh writes them back. Commit afterwards
+    # so the database job backend queues it.
+    enqueue("refresh_market_sketches", idempotency_key="refresh_market_sketches")
+
+
+def refresh_stale_sketches():
+    # Rewrites every dirty segment from the properties table
+    refreshed = 0
+
+    for row in MarketSketch.query.filter_by(dirty=True).with_for_update():
+        sketch = KLLSketch()
+        sketch.update_many(_segment_rents(row))
+
+        if sketch.count:
+            row.count = sketch.count
+            row.data = sketch.to_bytes()
+            row.dirty = False
+        else:
+            db.session.delete(row)
+
+        refreshed += 1
+
+    db.session.commit()
+
+    return refreshed
+
+
+@job_handler("refresh_market_sketches")
+def _refresh_market_sketches_job():
+    refresh_stale_sketches()
+
+
+# =========================================================
+# QUERIES
+# =========================================================
+def segment_sketch(city, locality, bedrooms, sqft):
+    # Comparables band for RentEngine, merged from its sqft buckets
+    rows = MarketSketch.query.filter(
+        MarketSketch.city == city.strip().lower(),
+        MarketSketch.locality == locality.strip().lower(),
+        MarketSketch.bedrooms == int(bedrooms),
+        MarketSketch.sqft_bucket.between(
+            sqft_bucket(sqft * 0.85),
+            sqft_bucket(sqft * 1.15)
+        )
+    ).all()
+
+    return _merge(rows)
+
+
+def market_sketch(city, locality=None, bedrooms=None):
+    # City-level rollups merge every locality (and bedroom count)
+    query = MarketSketch.query.filter(MarketSketch.city == city.strip().lower())
+
+    if locality:
+        query = query.filter(MarketSketch.locality == locality.strip().lower())
+
+    if bedrooms is not None:
+        query = query.filter(MarketSketch.bedrooms == int(bedrooms))
+
+    return _merge(query.all())
@@ -1,28 +1,19 @@
-import joblib
-import os
-from datetime import datetime
-
-MODEL_PATH = os.path.join(os.getcwd(), "ml", "rent_model.pkl")
-
-pipeline = joblib.load(MODEL_PATH)
+from app.utils.ml_loader import predict_rent
 
 
 class MLEngine:
 
     @staticmethod
-    def predict(city, locality, bhk, sqft, furnishing):
-
-        days_old = 0  # Assume fresh listing for prediction
-
-        input_data = [{
-            "city": city,
-            "locality": locality,
-            "bhk": bhk,
-            "sqft": sqft,
-            "furnishing": furnishing,
-            "days_old": days_old
-        }]
-
-        prediction = pipeline.predict(input_data)[0]
-
-        return round(float(prediction), 2)
\ No newline at end of file
+    def predict(city, locality, bhk, sqft, furnishing=None):
+
+        # The rent model is trained on city/locality/bedrooms/area_sqft
+        # only (train_model.py); furnishing is accepted for callers
+        # using the old signature but does not affect the estimate.
+        prediction = predict_rent(
+            city.strip().title(),
+            locality.strip().title(),
+            bhk,
+            sqft
+        )
+
+        return round(float(prediction), 2)
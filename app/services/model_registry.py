@@ -0,0 +1,137 @@
+import gc
+import hashlib
+import io
+import os
+import threading
+import joblib
+from app.services.compiled_forest import compile_pipeline
+
+
+# --------------------------------------------------
+# MODEL ARTIFACTS
+# --------------------------------------------------
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_DIR = os.getenv("MODEL_DIR", os.path.join(BASE_DIR, "ml"))
+
+RENT_MODEL = "rent"
+
+# name -> artifact file and the feature columns it was trained on
+# (see train_model.py)
+MODEL_SPECS = {
+    RENT_MODEL: {
+        "filename": "rent_model.pkl",
+        "features": ["city", "locality", "bedrooms", "area_sqft"],
+        "compile": True
+    }
+}
+
+
+class ModelSchemaError(Exception):
+    pass
+
+
+class LoadedModel:
+
+    def __init__(self, name, pipeline, version, path, features, compiled=None):
+        self.name = name
+        self.pipeline = pipeline
+        self.version = version
+        self.path = path
+        self.features = features
+        # NumPy-only evaluator (compiled_forest), None if not compilable
+        self.compiled = compiled
+
+
+class ModelRegistry:
+    """Loads each model artifact once per process.
+
+    Call preload() before gunicorn forks (preload_app = True) so the
+    workers share the fitted forest copy-on-write.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR, specs=MODEL_SPECS):
+        self.model_dir = model_dir
+        self.specs = specs
+        self._models = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        # callback(loaded_model) runs every time an artifact is (re)loaded
+        self._listeners.append(callback)
+
+    def path_for(self, name):
+        override = os.getenv(f"{name.upper()}_MODEL_PATH")
+        return override or os.path.join(self.model_dir, self.specs[name]["filename"])
+
+    def get(self, name=RENT_MODEL):
+        loaded = self._models.get(name)
+        if loaded is not None:
+            return loaded
+
+        with self._lock:
+            # Another thread may have loaded it while we waited
+            if name not in self._models:
+                self._models[name] = self._load(name)
+            return self._models[name]
+
+    def reload(self, name=RENT_MODEL):
+        with self._lock:
+            self._models[name] = self._load(name)
+            return self._models[name]
+
+    def preload(self, names=None):
+        for name in names or self.specs:
+            try:
+                self.get(name)
+            except (OSError, ModelSchemaError) as e:
+                # Workers fall back to loading lazily on first use
+                print(f"MODEL PRELOAD FAILED ({name}):", e)
+
+        # Move everything loaded so far out of the collector's view so
+        # forked workers don't dirty those pages on their first GC pass
+        gc.freeze()
+
+    def _load(self, name):
+        spec = self.specs[name]
+        path = self.path_for(name)
+
+        with open(path, "rb") as f:
+            raw = f.read()
+
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        pipeline = joblib.load(io.BytesIO(raw))
+
+        trained_on = getattr(pipeline, "feature_names_in_", None)
+        if trained_on is not None and list(trained_on) != spec["features"]:
+            raise ModelSchemaError(
+                f"{path} expects {list(trained_on)}, "
+                f"registry expects {spec['features']}"
+            )
+
+        print(f"MODEL LOADED: {name} v{version} from {path}")
+
+        compiled = compile_pipeline(pipeline) if spec.get("compile") else None
+
+        if compiled is not None:
+            # Artifacts are trained with n_jobs=-1; predict serially so the
+            # sklearn fallback returns exactly what the compiled path does.
+            # This pipeline was just loaded, so nothing else shares it.
+            pipeline.steps[-1][1].n_jobs = 1
+
+        loaded = LoadedModel(
+            name,
+            pipeline,
+            version,
+            path,
+            spec["features"],
+            compiled
+        )
+
+        for callback in self._listeners:
+            callback(loaded)
+
+        return loaded
+
+
+registry = ModelRegistry()
@@ -0,0 +1,242 @@
+import hashlib
+from app import db
+from app.models.prediction import Prediction
+from app.models.property import Property
+from app.services import response_cache
+from app.services.jobs import enqueue, job_handler
+from app.services.model_registry import registry, RENT_MODEL
+from app.utils.ml_loader import normalize_features, predict_rents
+
+FEATURE_FIELDS = ("city", "locality", "bedrooms", "area_sqft")
+
+# Rent this far above/below the estimate counts as over/underpriced
+PRICE_TOLERANCE = 2000
+
+
+# =========================================================
+# MARKET ANALYSIS
+# =========================================================
+def failed_analysis():
+    return {
+        "predicted_rent": 0,
+        "difference": 0,
+        "market_status": "Prediction failed",
+        "message": "Unable to estimate market value."
+    }
+
+
+def round_prediction(predicted):
+    # ✅ ROUND TO NEAREST ₹100
+    return round(float(predicted) / 100) * 100
+
+
+def market_status(actual_rent, predicted):
+
+    difference = round(actual_rent) - round_prediction(predicted)
+
+    if difference > PRICE_TOLERANCE:
+        return "Overpriced"
+    if difference < -PRICE_TOLERANCE:
+        return "Underpriced"
+    return "Fairly Priced"
+
+
+def build_market_analysis(actual_rent, predicted):
+
+    predicted = round_prediction(predicted)
+
+    actual_rent = round(actual_rent)
+    difference = actual_rent - predicted
+    abs_diff = abs(difference)
+
+    status = market_status(actual_rent, predicted)
+
+    if status == "Overpriced":
+        message = f"₹{abs_diff} higher than market average"
+    elif status == "Underpriced":
+        message = f"₹{abs_diff} lower than market average"
+    else:
+        message = f"₹{abs_diff} close to market average"
+
+    lower_bound = round(predicted * 0.9)
+    upper_bound = round(predicted * 1.1)
+
+    return {
+        "predicted_rent": predicted,
+        "difference": difference,
+        "market_status": status,
+        "message": message,
+        "market_range": {
+            "low": lower_bound,
+            "high": upper_bound
+        }
+    }
+
+
+# =========================================================
+# STORED PREDICTIONS
+# =========================================================
+def property_features(property_obj):
+    return {f: getattr(property_obj, f) for f in FEATURE_FIELDS}
+
+
+def features_key(features):
+    normalized = repr(normalize_features(features)).encode()
+    return hashlib.sha1(normalized).hexdigest()
+
+
+def _new_prediction(property_obj, predicted, model_version, key):
+
+    predicted_rounded = round_prediction(predicted)
+
+    # fairness_score: % the asked rent sits above (+) or below (-) the estimate
+    fairness = 0.0
+    if predicted_rounded:
+        fairness = round(
+            (property_obj.rent - predicted_rounded) / predicted_rounded * 100,
+            2
+        )
+
+    return Prediction(
+        property_id=property_obj.id,
+        predicted_rent=float(predicted),
+        fairness_score=fairness,
+        is_overpriced=market_status(property_obj.rent, predicted) == "Overpriced",
+        model_version=model_version,
+        features_key=key
+    )
+
+
+def _badge_changed(property_obj, stored, predicted):
+    # Listing cards show market_status(rent, latest prediction); the
+    # detail page shows no prediction, so only a new badge stales a page
+    before = market_status(property_obj.rent, stored.predicted_rent) if stored else None
+    return before != market_status(property_obj.rent, predicted)
+
+
+def predict_for_property(property_obj):
+    # Returns the raw model estimate, reusing the stored prediction when
+    # neither the features nor the model version have changed
+    model_version = registry.get(RENT_MODEL).version
+    features = property_features(property_obj)
+    key = features_key(features)
+
+    stored = Prediction.latest_for(property_obj.id)
+
+    if (
+        stored
+        and stored.model_version == model_version
+        and stored.features_key == key
+    ):
+        # Rent may have changed since; keep the badge fields current
+        fresh = _new_prediction(property_obj, stored.predicted_rent, model_version, key)
+        if (stored.fairness_score, stored.is_overpriced) != (fresh.fairness_score, fresh.is_overpriced):
+            stored.fairness_score = fresh.fairness_score
+            stored.is_overpriced = fresh.is_overpriced
+            db.session.commit()
+        return stored.predicted_rent
+
+    predicted = predict_rents([features])[0]
+    badge_changed = _badge_changed(property_obj, stored, predicted)
+
+    db.session.add(_new_prediction(property_obj, predicted, model_version, key))
+    db.session.commit()
+
+    if badge_changed:
+        response_cache.invalidate()
+
+    return predicted
+
+
+def recompute_predictions(batch_size=500, force=False):
+    # Walks every property in id order and stores a fresh prediction
+    # for those whose latest one is missing or stale. Run after a model
+    # retrain so listing badges and analyses stay in sync.
+    model_version = registry.get(RENT_MODEL).version
+
+    last_id = 0
+    updated = 0
+    badges_changed = False
+
+    while True:
+        batch = Property.query.filter(
+            Property.id > last_id
+        ).order_by(Property.id).limit(batch_size).all()
+
+        if not batch:
+            break
+
+        last_id = batch[-1].id
+
+        latest_ids = db.session.query(
+            db.func.max(Prediction.id)
+        ).filter(
+            Prediction.property_id.in_([p.id for p in batch])
+        ).group_by(Prediction.property_id)
+
+        latest = {
+            pred.property_id: pred
+            for pred in Prediction.query.filter(Prediction.id.in_(latest_ids))
+        }
+
+        stale = []
+        for property_obj in batch:
+            features = property_features(property_obj)
+            key = features_key(features)
+            stored = latest.get(property_obj.id)
+
+            if (
+                force
+                or not stored
+                or stored.model_version != model_version
+                or stored.features_key != key
+            ):
+                stale.append((property_obj, features, key))
+
+        if stale:
+            predictions = predict_rents([features for _, features, _ in stale])
+
+            for (property_obj, _, key), predicted in zip(stale, predictions):
+                badges_changed |= _badge_changed(property_obj, latest.get(property_obj.id), predicted)
+                db.session.add(
+                    _new_prediction(property_obj, predicted, model_version, key)
+                )
+
+            db.session.commit()
+            updated += len(stale)
+
+        # Keep the identity map from growing across batches
+        db.session.expunge_all()
+
+    if badges_changed:
+        response_cache.invalidate()
+
+    return updated
+
+
+# -----------------------
+# Background jobs
+# -----------------------
+@job_handler("predict_property")
+def _predict_property_job(property_id):
+    property_obj = db.session.get(Property, property_id)
+    if property_obj is not None:
+        predict_for_property(property_obj)
+
+
+@job_handler("recompute_predictions")
+def _recompute_predictions_job(batch_size=500, force=False):
+    recompute_predictions(batch_size=batch_size, force=force)
+
+
+def schedule_prediction(property_obj):
+    # Warms the stored prediction after a listing is created or edited,
+    # so the next analysis is a lookup instead of a model call. The key
+    # only dedupes in-flight jobs; the handler itself skips fresh rows.
+    # Commit afterwards so the database job backend queues it.
+    key = features_key(property_features(property_obj))
+    enqueue(
+        "predict_property",
+        idempotency_key=f"predict:{property_obj.id}:{key}",
+        property_id=property_obj.id
+    )
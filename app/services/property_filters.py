@@ -0,0 +1,52 @@
+import hashlib
+import json
+from flask import current_app
+from app import db
+from app.models.property import Property
+from app.utils.cache import TTLCache
+
+
+# Cached city -> localities map for GET /properties/filters.
+# Property writes in this process clear it; other gunicorn workers
+# pick up changes when their entry expires (FILTERS_CACHE_TTL).
+_cache = TTLCache(maxsize=1)
+_CACHE_KEY = "filters"
+
+
+def _build_filters():
+
+    rows = db.session.query(
+        Property.city,
+        Property.locality
+    ).distinct().order_by(Property.city, Property.locality).all()
+
+    city_map = {}
+    for city, locality in rows:
+        city_map.setdefault(city, []).append(locality)
+
+    payload = {"cities": city_map}
+
+    etag = hashlib.sha1(
+        json.dumps(payload, sort_keys=True).encode()
+    ).hexdigest()
+
+    return payload, etag
+
+
+def get_filters():
+    # Returns (payload, etag)
+    cached = _cache.get(_CACHE_KEY)
+
+    if cached is None:
+        cached = _build_filters()
+        _cache.set(
+            _CACHE_KEY,
+            cached,
+            ttl=current_app.config["FILTERS_CACHE_TTL"]
+        )
+
+    return cached
+
+
+def invalidate_filters():
+    _cache.clear()
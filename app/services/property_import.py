@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+import math
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.property import Property
+from app.services import market_sketches, property_filters, response_cache
+from app.services.jobs import enqueue
+from app.services.segment_stats import segment_stats
+
+IMPORT_FORMATS = {
+    "csv": ("csv", "text/csv"),
+    "jsonl": ("jsonl", "ndjson", "application/x-ndjson", "application/jsonl"),
+}
+
+# The summary keeps the first N row errors; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+# =========================================================
+# NORMALIZATION (SHARED WITH create_property)
+# =========================================================
+def _text(raw, field):
+    value = raw.get(field)
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be text")
+    return value
+
+
+def normalize_listing(raw):
+    # Raises ValueError with a user-facing message
+    city = _text(raw, "city").strip().title()
+    locality = _text(raw, "locality").strip().title()
+
+    if not city or not locality:
+        raise ValueError("City and locality required")
+
+    if len(city) > 100 or len(locality) > 150:
+        raise ValueError("City or locality too long")
+
+    try:
+        bedrooms = int(raw.get("bedrooms"))
+        area_sqft = float(raw.get("area_sqft"))
+        rent = float(raw.get("rent"))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("bedrooms, area_sqft and rent must be numbers")
+
+    if not math.isfinite(area_sqft) or not math.isfinite(rent):
+        raise ValueError("area_sqft and rent must be finite")
+
+    rent = round(rent)
+
+    if bedrooms <= 0 or area_sqft <= 0 or rent <= 0:
+        raise ValueError("bedrooms, area_sqft and rent must be positive")
+
+    return {
+        "city": city,
+        "locality": locality,
+        "bedrooms": bedrooms,
+        "area_sqft": area_sqft,
+        "rent": rent,
+        "description": _text(raw, "description")
+    }
+
+
+# =========================================================
+# PARSING
+# =========================================================
+def detect_format(filename=None, content_type=None, requested=None):
+    hints = [requested, content_type and content_type.split(";")[0].strip()]
+    if filename and "." in filename:
+        hints.append(filename.rsplit(".", 1)[1])
+
+    for hint in hints:
+        for fmt, aliases in IMPORT_FORMATS.items():
+            if hint and hint.lower() in aliases:
+                return fmt
+
+    return None
+
+
+def iter_records(stream, fmt):
+    # Yields (line_no, dict, None) one row at a time from a binary
+    # stream, or (line_no, None, error) for a row that can't be parsed
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line_no = 0
+
+    try:
+        if fmt == "csv":
+            reader = csv.DictReader(text)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    # The reader resumes on the next line
+                    yield reader.line_num, None, f"Malformed CSV row: {e}"
+                    continue
+                line_no = reader.line_num
+                yield line_no, row, None
+
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            if isinstance(record, dict):
+                yield line_no, record, None
+            else:
+                yield line_no, None, "Row is not a JSON object"
+
+    except UnicodeDecodeError:
+        # Nothing past an undecodable chunk can be trusted
+        yield line_no + 1, None, "File is not valid UTF-8; import stopped here"
+
+
+# =========================================================
+# IMPORT
+# =========================================================
+def _insert_chunk(chunk, owner_id):
+    rows = [dict(listing, owner_id=owner_id) for _, listing in chunk]
+
+    # executemany with RETURNING (batched by SQLAlchemy's insertmanyvalues)
+    ids = db.session.scalars(
+        db.insert(Property).returning(Property.id),
+        rows
+    ).all()
+
+    if current_app.config["MARKET_SKETCHES_ENABLED"]:
+        market_sketches.record_rents([
+            (r["city"], r["locality"], r["bedrooms"], r["area_sqft"], r["rent"])
+            for r in rows
+        ])
+
+    db.session.commit()
+    return ids
+
+
+def import_listings(stream, fmt, owner_id, chunk_size=1000):
+    """Stream-imports listings for one owner, committing every chunk.
+
+    A generator: yields a progress dict after each chunk and a final
+    summary (with the first row errors) once the stream is exhausted.
+    """
+    summary = {"processed": 0, "inserted": 0, "failed": 0, "errors": []}
+    chunk = []
+
+    def fail(line_no, message, rows=1):
+        summary["failed"] += rows
+        if len(summary["errors"]) < MAX_REPORTED_ERRORS:
+            summary["errors"].append({"row": line_no, "error": message})
+
+    def flush():
+        try:
+            summary["inserted"] += len(_insert_chunk(chunk, owner_id))
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print("IMPORT CHUNK ERROR:", e)
+            fail(chunk[0][0], f"Insert failed for rows {chunk[0][0]}-{chunk[-1][0]}", len(chunk))
+        chunk.clear()
+
+    def progress():
+        return {k: summary[k] for k in ("processed", "inserted", "failed")}
+
+    try:
+        for line_no, raw, error in iter_records(stream, fmt):
+            summary["processed"] += 1
+
+            if error:
+                fail(line_no, error)
+                continue
+
+            try:
+                chunk.append((line_no, normalize_listing(raw)))
+            except ValueError as e:
+                fail(line_no, str(e))
+                continue
+
+            if len(chunk) >= chunk_size:
+                flush()
+                yield progress()
+
+        if chunk:
+            flush()
+
+    finally:
+        # Committed chunks are live even when the stream fails or the
+        # client goes away mid-import (the generator is closed)
+        if summary["inserted"]:
+            property_filters.invalidate_filters()
+            response_cache.invalidate()
+            segment_stats.invalidate()
+            enqueue("recompute_predictions")
+            db.session.commit()
+
+    yield dict(summary, done=True)
@@ -1,84 +1,158 @@
-import os
-import joblib
-import pandas as pd
 import numpy as np
+from flask import current_app
 from sqlalchemy import and_
 
+from app import db
 from app.models.property import Property
+from app.services.model_registry import registry, RENT_MODEL
+from app.services.market_sketches import segment_sketch
+from app.services.segment_stats import segment_stats
+from app.utils.ml_loader import predict_rent
 
 
 # --------------------------------------------------
-# MODEL PATH
+# COMPARABLES BENCHMARK
 # --------------------------------------------------
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(BASE_DIR, "ml", "rent_model.pkl")
+class MarketBenchmark:
+    """Sorted comparable rents that can score many asked rents at once."""
+
+    def __init__(self, rents):
+        self.rents = np.sort(np.asarray(rents, dtype=np.float64))
+
+    @property
+    def count(self):
+        return len(self.rents)
+
+    def confidence(self):
+        if self.count > 80:
+            return "High"
+        elif self.count > 30:
+            return "Medium"
+        return "Low"
+
+    def percentiles(self, asked_rents):
+        # Share of comparables at or below each asked rent
+        asked = np.asarray(asked_rents, dtype=np.float64)
+        below = np.searchsorted(self.rents, asked, side="right")
+        return below / self.count * 100
+
+    def summary(self):
+        # (fair rent, min, max)
+        return (
+            float(self.rents.mean()),
+            float(self.rents[0]),
+            float(self.rents[-1])
+        )
 
+    def score(self, asked_rents):
 
-class RentEngine:
+        asked = np.asarray(asked_rents, dtype=np.float64)
+
+        fair_rent, min_rent, max_rent = self.summary()
+        confidence = self.confidence()
+
+        overpricing = (asked - fair_rent) / fair_rent * 100
+        percentiles = self.percentiles(asked)
+
+        # Market position
+        positions = np.where(
+            percentiles < 25,
+            "Below Market",
+            np.where(percentiles < 75, "Market Range", "Premium")
+        )
+
+        return [
+            {
+                "comparables_count": self.count,
+                "fair_rent": round(fair_rent, 2),
+                "overpricing_percent": round(float(o), 2),
+                "price_range": {
+                    "min": min_rent,
+                    "max": max_rent
+                },
+                "confidence_score": confidence,
+                "market_position_label": str(position),
+                "market_position_percentile": round(float(p), 2)
+            }
+            for o, p, position in zip(overpricing, percentiles, positions)
+        ]
+
+
+class SketchBenchmark(MarketBenchmark):
+    """Same scoring, answered from a KLLSketch instead of raw rents."""
+
+    def __init__(self, sketch):
+        self.sketch = sketch
+
+    @property
+    def count(self):
+        return self.sketch.count
+
+    def summary(self):
+        return self.sketch.mean, self.sketch.min, self.sketch.max
 
-    model = None
+    def percentiles(self, asked_rents):
+        return self.sketch.rank(asked_rents) / self.count * 100
+
+
+class RentEngine:
 
     # --------------------------------------------------
     # LOAD ML MODEL
     # --------------------------------------------------
     @classmethod
     def load_model(cls):
-       if cls.model is None:
-          if os.path.exists(MODEL_PATH):
-            cls.model = joblib.load(MODEL_PATH)
-            print("ML Model Loaded")
-          else:
-             print("ML model not found at:", MODEL_PATH)
+        return registry.get(RENT_MODEL).pipeline
 
     # --------------------------------------------------
-    # BENCHMARK CALCULATION
+    # COMPARABLE RENTS
     # --------------------------------------------------
     @staticmethod
-    def calculate_benchmark(comparables, asked_rent):
+    def comparable_rents(city, locality, bhk, sqft):
 
-        rents = sorted([p.rent for p in comparables])
+        if current_app.config["SEGMENT_STATS_ENABLED"]:
+            return segment_stats.comparable_rents(city, locality, bhk, sqft)
 
-        fair_rent = float(np.mean(rents))
-        min_rent = float(min(rents))
-        max_rent = float(max(rents))
+        rents = db.session.execute(
+            RentEngine.comparables_query(city, locality, bhk, sqft)
+        ).scalars()
 
-        overpricing_percent = (
-            (asked_rent - fair_rent) / fair_rent
-        ) * 100
+        return np.fromiter(rents, dtype=np.float64)
 
-        percentile = (
-            sum(r <= asked_rent for r in rents)
-            / len(rents)
-        ) * 100
+    @staticmethod
+    def comparables_query(city, locality, bhk, sqft):
+        # Only the rent column; no Property objects are hydrated.
+        # city/locality are stored title-cased, so equality on the
+        # normalized values matches the segment store and lets
+        # ix_properties_segment serve the lookup.
+        return db.select(Property.rent).where(
+            and_(
+                Property.city == city.strip().title(),
+                Property.locality == locality.strip().title(),
+                Property.bedrooms == bhk,
+                Property.area_sqft.between(
+                    sqft * 0.85,
+                    sqft * 1.15
+                )
+            )
+        )
 
-        # Confidence logic
-        if len(rents) > 80:
-            confidence = "High"
-        elif len(rents) > 30:
-            confidence = "Medium"
-        else:
-            confidence = "Low"
+    @classmethod
+    def comparable_benchmark(cls, city, locality, bhk, sqft):
 
-        # Market position
-        if percentile < 25:
-            position = "Below Market"
-        elif percentile < 75:
-            position = "Market Range"
-        else:
-            position = "Premium"
+        if current_app.config["MARKET_SKETCHES_ENABLED"]:
+            sketch = segment_sketch(city, locality, bhk, sqft)
+            return SketchBenchmark(sketch) if sketch and sketch.count else None
 
-        return {
-            "comparables_count": len(rents),
-            "fair_rent": round(fair_rent, 2),
-            "overpricing_percent": round(overpricing_percent, 2),
-            "price_range": {
-                "min": min_rent,
-                "max": max_rent
-            },
-            "confidence_score": confidence,
-            "market_position_label": position,
-            "market_position_percentile": round(percentile, 2)
-        }
+        rents = cls.comparable_rents(city, locality, bhk, sqft)
+        return MarketBenchmark(rents) if len(rents) else None
+
+    # --------------------------------------------------
+    # BENCHMARK CALCULATION
+    # --------------------------------------------------
+    @staticmethod
+    def calculate_benchmark(rents, asked_rent):
+        return MarketBenchmark(rents).score([asked_rent])[0]
 
     # --------------------------------------------------
     # ML PREDICTION
@@ -86,22 +160,13 @@ class RentEngine:
     @classmethod
     def ml_predict(cls, city, locality, bhk, sqft):
 
-        cls.load_model()
-
-        if cls.model is None:
-            return None
-
-        input_df = pd.DataFrame([{
-            "city": city.lower(),
-            "locality": locality.lower(),
-            "bhk": bhk,
-            "sqft": sqft,
-            "furnishing": "semi",
-            "days_old": 30
-        }])
-
         try:
-            prediction = cls.model.predict(input_df)[0]
+            prediction = predict_rent(
+                city.strip().title(),
+                locality.strip().title(),
+                bhk,
+                sqft
+            )
             return round(float(prediction), 2)
         except Exception as e:
             print("ML prediction error:", e)
@@ -113,41 +178,28 @@ class RentEngine:
     @classmethod
     def analyze(cls, city, locality, bhk, sqft, asked_rent):
 
-        comparables = Property.query.filter(
-            and_(
-                Property.city.ilike(f"%{city}%"),
-                Property.locality.ilike(f"%{locality}%"),
-                Property.bhk == bhk,
-                Property.sqft.between(
-                    sqft * 0.85,
-                    sqft * 1.15
-                )
-            )
-        ).all()
-
-        if not comparables:
-            return {
-                "benchmark": None,
-                "ml_prediction": {
-                    "predicted_rent": cls.ml_predict(city, locality, bhk, sqft)
-                }
-            }
+        result = cls.analyze_many(city, locality, bhk, sqft, [asked_rent])
 
-        benchmark_data = cls.calculate_benchmark(
-            comparables,
-            asked_rent
-        )
+        return {
+            "benchmark": result["benchmarks"][0] if result["benchmarks"] else None,
+            "ml_prediction": result["ml_prediction"]
+        }
 
-        ml_prediction_value = cls.ml_predict(
-            city,
-            locality,
-            bhk,
-            sqft
-        )
+    # --------------------------------------------------
+    # WHAT-IF: MANY ASKED RENTS, ONE COMPARABLE SET
+    # --------------------------------------------------
+    @classmethod
+    def analyze_many(cls, city, locality, bhk, sqft, asked_rents):
+
+        benchmark = cls.comparable_benchmark(city, locality, bhk, sqft)
+
+        benchmarks = []
+        if benchmark is not None:
+            benchmarks = benchmark.score(asked_rents)
 
         return {
-            "benchmark": benchmark_data,
+            "benchmarks": benchmarks,
             "ml_prediction": {
-                "predicted_rent": ml_prediction_value
+                "predicted_rent": cls.ml_predict(city, locality, bhk, sqft)
             }
-        }
\ No newline at end of file
+        }
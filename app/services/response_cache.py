@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from functools import wraps
+from flask import current_app, make_response, request
+from werkzeug.datastructures import ImmutableMultiDict
+from app.utils.cache import TTLCache
+
+LISTING = "listing"
+
+
+def property_scope(property_id):
+    return f"property:{property_id}"
+
+
+# =========================================================
+# BACKENDS
+# =========================================================
+class MemoryBackend:
+    """Per-process LRU. Invalidations only reach this worker."""
+
+    name = "memory"
+
+    def __init__(self, maxsize, ttl):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, entry):
+        self._entries.set(key, entry)
+
+    def generation(self, scope):
+        return self._generations.get(scope, 0)
+
+    def bump(self, scope):
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def stats(self):
+        return self._entries.stats()
+
+
+class FileBackend:
+    """Entries and generation counters as files in a shared directory.
+
+    Every gunicorn worker (and worker.py) on the host sees the same
+    generations, so a write in one process invalidates all of them.
+    Writes go through a temp file + os.replace, so readers never see a
+    partial entry.
+    """
+
+    name = "filesystem"
+    PRUNE_EVERY = 200
+
+    def __init__(self, directory, ttl):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, prefix, name):
+        return os.path.join(self.directory, f"{prefix}-{hashlib.sha256(name.encode()).hexdigest()}")
+
+    def _write(self, path, text):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def get(self, key):
+        try:
+            with open(self._path("entry", key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self.ttl and entry["expires_at"] < time.time():
+            return None
+        return entry
+
+    def set(self, key, entry):
+        self._write(self._path("entry", key), json.dumps(dict(entry, expires_at=time.time() + (self.ttl or 0))))
+
+        if random.randrange(self.PRUNE_EVERY) == 0:
+            self._prune()
+
+    def generation(self, scope):
+        try:
+            with open(self._path("gen", scope)) as f:
+                return f.read()
+        except OSError:
+            return "0"
+
+    def bump(self, scope):
+        # A fresh unique value rather than read-increment-write, so
+        # concurrent bumps from different workers can't collide
+        self._write(self._path("gen", scope), f"{time.time_ns()}-{os.getpid()}")
+
+    def _prune(self):
+        # Superseded generations leave entries nobody asks for; TTL expiry cleans them up
+        now = time.time()
+        max_age = self.ttl or 3600
+        for name in os.listdir(self.directory):
+            if name.startswith("entry-"):
+                path = os.path.join(self.directory, name)
+                try:
+                    if now - os.path.getmtime(path) > max_age:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    def stats(self):
+        return {"entries": sum(1 for n in os.listdir(self.directory) if n.startswith("entry-"))}
+
+
+# =========================================================
+# APP WIRING
+# =========================================================
+def init_response_cache(app):
+    backend = app.config["RESPONSE_CACHE_BACKEND"]
+    ttl = app.config["RESPONSE_CACHE_TTL"]
+
+    if backend == "memory":
+        app.extensions["response_cache"] = MemoryBackend(app.config["RESPONSE_CACHE_SIZE"], ttl)
+    elif backend == "filesystem":
+        app.extensions["response_cache"] = FileBackend(app.config["RESPONSE_CACHE_DIR"], ttl)
+    elif backend != "none":
+        raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND {backend!r}")
+
+
+def _backend():
+    return current_app.extensions.get("response_cache")
+
+
+def invalidate(property_id=None):
+    # Any listing-visible change bumps the listing generation; changes to
+    # one property also retire its detail response
+    backend = _backend()
+    if backend is None:
+        return
+
+    backend.bump(LISTING)
+    if property_id is not None:
+        backend.bump(property_scope(property_id))
+
+
+def _cache_key(scopes, view_kwargs):
+    # Exact values, empty ones included: "?cursor=" switches the listing
+    # to keyset pagination
+    params = sorted(request.args.items(multi=True))
+    generations = [f"{scope}@{_backend().generation(scope)}" for scope in scopes]
+
+    return json.dumps([request.endpoint, view_kwargs, params, generations], sort_keys=True)
+
+
+def _cache_headers(response):
+    max_age = current_app.config["RESPONSE_CACHE_MAX_AGE"]
+    response.headers["Cache-Control"] = f"public, max-age={max_age}" if max_age else "public, no-cache"
+    response.vary.add("Authorization")
+    return response.make_conditional(request)
+
+
+def cached_response(scopes, params=()):
+    """Serve a public GET view from the response cache.
+
+    `scopes(**view_kwargs)` names the generations the response depends
+    on; bumping any of them (see invalidate) retires the entry.
+    `params` are the query parameters the view reads. They form the key,
+    and the view sees only those, so a parameter missing from the list
+    can't change a cached response.
+
+    Requests carrying a token skip the cache, since they may get
+    per-user fields.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            if _backend() is None or request.headers.get("Authorization"):
+                response = make_response(view(**kwargs))
+                response.headers.setdefault("Cache-Control", "private, no-cache")
+                response.vary.add("Authorization")
+                return response
+
+            request.args = ImmutableMultiDict(
+                (name, value)
+                for name, value in request.args.items(multi=True)
+                if name in params
+            )
+
+            key = _cache_key(scopes(**kwargs), kwargs)
+            entry = _backend().get(key)
+
+            if entry is not None:
+                response = current_app.response_class(entry["body"], mimetype=entry["mimetype"])
+                response.set_etag(entry["etag"])
+                response.headers["X-Cache"] = "HIT"
+                return _cache_headers(response)
+
+            response = make_response(view(**kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            body = response.get_data(as_text=True)
+            etag = hashlib.sha256(body.encode()).hexdigest()[:32]
+            _backend().set(key, {"body": body, "etag": etag, "mimetype": response.mimetype})
+
+            response.set_etag(etag)
+            response.headers["X-Cache"] = "MISS"
+            return _cache_headers(response)
+
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    backend = _backend()
+    if backend is None:
+        return None
+    return dict(backend.stats(), backend=backend.name)
@@ -0,0 +1,148 @@
+import threading
+import time
+import numpy as np
+from flask import current_app
+from app import db
+from app.models.property import Property
+
+
+def _segment_key(city, locality, bedrooms):
+    return (city.strip().lower(), locality.strip().lower(), int(bedrooms))
+
+
+def snapshot(property_obj):
+    # The fields a property contributes to its market segment
+    return (
+        property_obj.city,
+        property_obj.locality,
+        property_obj.bedrooms,
+        property_obj.area_sqft,
+        property_obj.rent
+    )
+
+
+class SegmentStatsStore:
+    """In-memory comparable rents per (city, locality, bedrooms).
+
+    Each segment holds two aligned arrays sorted by area, so the
+    +/-15% sqft band RentEngine compares against is a pair of
+    searchsorted calls instead of a table scan. Writes made by this
+    process are applied incrementally; everything is rebuilt from the
+    database once SEGMENT_STATS_TTL expires so other workers' writes
+    show up too.
+    """
+
+    def __init__(self):
+        # key -> (areas, rents); tuples are swapped, never mutated, so
+        # readers need no lock
+        self._segments = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    # LOADING
+    # --------------------------------------------------
+    def _expired(self):
+        ttl = current_app.config["SEGMENT_STATS_TTL"]
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > ttl
+
+    def _ensure_loaded(self):
+        if not self._expired():
+            return
+
+        with self._lock:
+            if self._expired():
+                self._rebuild()
+
+    def _rebuild(self):
+        rows = db.session.execute(
+            db.select(
+                Property.city,
+                Property.locality,
+                Property.bedrooms,
+                Property.area_sqft,
+                Property.rent
+            )
+        )
+
+        grouped = {}
+        for city, locality, bedrooms, area, rent in rows:
+            key = _segment_key(city, locality, bedrooms)
+            grouped.setdefault(key, []).append((area, rent))
+
+        segments = {}
+        for key, pairs in grouped.items():
+            data = np.array(pairs, dtype=np.float64)
+            order = np.argsort(data[:, 0], kind="stable")
+            segments[key] = (data[order, 0], data[order, 1])
+
+        self._segments = segments
+        self._loaded_at = time.monotonic()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    # --------------------------------------------------
+    # QUERIES
+    # --------------------------------------------------
+    def comparable_rents(self, city, locality, bedrooms, sqft):
+
+        self._ensure_loaded()
+
+        segment = self._segments.get(_segment_key(city, locality, bedrooms))
+        if segment is None:
+            return np.empty(0, dtype=np.float64)
+
+        areas, rents = segment
+        start = np.searchsorted(areas, sqft * 0.85, side="left")
+        end = np.searchsorted(areas, sqft * 1.15, side="right")
+
+        return rents[start:end]
+
+    # --------------------------------------------------
+    # INCREMENTAL UPDATES
+    # --------------------------------------------------
+    def _add(self, city, locality, bedrooms, area, rent):
+        key = _segment_key(city, locality, bedrooms)
+        areas, rents = self._segments.get(key, (np.empty(0), np.empty(0)))
+
+        position = np.searchsorted(areas, area, side="right")
+        self._segments[key] = (
+            np.insert(areas, position, area),
+            np.insert(rents, position, rent)
+        )
+
+    def _remove(self, city, locality, bedrooms, area, rent):
+        key = _segment_key(city, locality, bedrooms)
+        segment = self._segments.get(key)
+        if segment is None:
+            return
+
+        areas, rents = segment
+        start = np.searchsorted(areas, area, side="left")
+        end = np.searchsorted(areas, area, side="right")
+        matches = np.nonzero(rents[start:end] == rent)[0]
+        if not len(matches):
+            return
+
+        position = start + matches[0]
+        self._segments[key] = (
+            np.delete(areas, position),
+            np.delete(rents, position)
+        )
+
+    def apply_change(self, before=None, after=None):
+        # before/after: snapshot() tuples, None for create/delete
+        with self._lock:
+            # Nothing loaded yet; the first query will read the new state
+            if self._loaded_at is None:
+                return
+
+            if before is not None:
+                self._remove(*before)
+            if after is not None:
+                self._add(*after)
+
+
+segment_stats = SegmentStatsStore()
@@ -0,0 +1,220 @@
+import time
+from datetime import datetime, timedelta
+import numpy as np
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.property import Property
+from app.models.property_image import PropertyImage
+from app.models.review import Review
+from app.models.user import User
+from app.models.wishlist import Wishlist
+from app.services.market_data import (
+    AREA_SQFT_RANGE,
+    BEDROOM_PREMIUM,
+    BEDROOM_RANGE,
+    MIN_RENT,
+    RENT_NOISE,
+    segments
+)
+
+SEED_EMAIL_DOMAIN = "seed.rentwise.test"
+SEED_PASSWORD = "password"
+SEED_IMAGE_URL = "https://picsum.photos/seed/rentwise-{property_id}-{n}/1024/768"
+
+REVIEW_COMMENTS = np.array([
+    "Great location",
+    "Spacious and well maintained",
+    "Owner was responsive",
+    "A bit overpriced",
+    "Noisy street",
+    "Good value for money",
+])
+# P(rating = 1..5)
+RATING_WEIGHTS = np.array([0.05, 0.10, 0.20, 0.35, 0.30])
+
+
+# =========================================================
+# GENERATORS (PURE NUMPY, NO DB)
+# =========================================================
+def property_columns(rng, n, owner_ids):
+    # Same pricing as train_model.py: a city is picked uniformly, then
+    # one of its localities
+    table = segments()
+    cities = np.array([c for c, _, _ in table])
+    localities = np.array([l for _, l, _ in table])
+    rates = np.array([r for _, _, r in table])
+
+    city_names, first_row, per_city = np.unique(cities, return_index=True, return_counts=True)
+    city_idx = rng.integers(0, len(city_names), n)
+    row = first_row[city_idx] + (rng.random(n) * per_city[city_idx]).astype(np.int64)
+
+    bedrooms = rng.integers(*BEDROOM_RANGE, n)
+    area_sqft = rng.integers(*AREA_SQFT_RANGE, n)
+
+    rent = (
+        area_sqft * rates[row]
+        + bedrooms * BEDROOM_PREMIUM
+        + rng.integers(*RENT_NOISE, n)
+    )
+    rent = np.maximum(MIN_RENT, np.round(rent)).astype(np.int64)
+
+    age_seconds = rng.integers(0, 365 * 86400, n)
+
+    return {
+        "city": cities[row],
+        "locality": localities[row],
+        "bedrooms": bedrooms,
+        "area_sqft": area_sqft.astype(np.float64),
+        "rent": rent,
+        "owner_id": rng.choice(owner_ids, n),
+        "age_seconds": age_seconds
+    }
+
+
+def distinct_pairs(rng, counts, user_ids):
+    # For property i, counts[i] distinct users: a run of consecutive
+    # users starting at a random offset (so no (user, property) repeats)
+    counts = np.minimum(counts, len(user_ids))
+    owner = np.repeat(np.arange(len(counts)), counts)
+
+    starts = rng.integers(0, len(user_ids), len(counts))
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    return owner, user_ids[(starts[owner] + offsets) % len(user_ids)]
+
+
+def _rows(columns):
+    # Column arrays -> list of row dicts with native Python values
+    names = list(columns)
+    values = [columns[name].tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+# =========================================================
+# BULK LOAD
+# =========================================================
+def _insert_users(count, renter_share, start, rng):
+    # One hash for every seeded account; hashing per row would dominate
+    password_hash = generate_password_hash(SEED_PASSWORD)
+    renters = rng.random(count) < renter_share
+
+    rows = [
+        {
+            "email": f"user{start + i}@{SEED_EMAIL_DOMAIN}",
+            "password_hash": password_hash,
+            "role": "renter" if is_renter else "customer"
+        }
+        for i, is_renter in enumerate(renters.tolist())
+    ]
+
+    ids = db.session.execute(
+        User.__table__.insert().returning(User.__table__.c.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
+
+    ids = np.array(ids)
+    return ids[renters], ids[~renters]
+
+
+def _insert_chunk(rng, n, owners, customers, reviews_per_property, wishlists_per_property, max_images):
+    columns = property_columns(rng, n, owners)
+
+    review_prop, review_user = distinct_pairs(rng, rng.poisson(reviews_per_property, n), customers)
+    ratings = rng.choice(np.arange(1, 6), len(review_prop), p=RATING_WEIGHTS)
+
+    # Aggregates are known up front, so no backfill pass is needed
+    columns["review_count"] = np.bincount(review_prop, minlength=n)
+    columns["rating_sum"] = np.bincount(review_prop, weights=ratings, minlength=n).astype(np.int64)
+
+    now = datetime.utcnow()
+    columns["created_at"] = np.array(
+        [now - timedelta(seconds=s) for s in columns.pop("age_seconds").tolist()]
+    )
+    columns["description"] = np.array([
+        f"{b} BHK in {l}, {c}"
+        for b, l, c in zip(columns["bedrooms"].tolist(), columns["locality"].tolist(), columns["city"].tolist())
+    ])
+
+    property_ids = np.array(db.session.execute(
+        Property.__table__.insert().returning(Property.__table__.c.id, sort_by_parameter_order=True),
+        _rows(columns)
+    ).scalars().all())
+
+    if len(review_prop):
+        db.session.execute(Review.__table__.insert(), _rows({
+            "rating": ratings,
+            "comment": REVIEW_COMMENTS[rng.integers(0, len(REVIEW_COMMENTS), len(review_prop))],
+            "user_id": review_user,
+            "property_id": property_ids[review_prop]
+        }))
+
+    wish_prop, wish_user = distinct_pairs(rng, rng.poisson(wishlists_per_property, n), customers)
+    if len(wish_prop):
+        db.session.execute(Wishlist.__table__.insert(), _rows({
+            "user_id": wish_user,
+            "property_id": property_ids[wish_prop]
+        }))
+
+    image_counts = rng.integers(1, max_images + 1, n)
+    image_prop = np.repeat(property_ids, image_counts)
+    image_n = np.arange(len(image_prop)) - np.repeat(np.cumsum(image_counts) - image_counts, image_counts)
+    db.session.execute(PropertyImage.__table__.insert(), [
+        {
+            "image_filename": SEED_IMAGE_URL.format(property_id=p, n=k),
+            "property_id": p
+        }
+        for p, k in zip(image_prop.tolist(), image_n.tolist())
+    ])
+
+    return {
+        "properties": n,
+        "reviews": len(review_prop),
+        "wishlist": len(wish_prop),
+        "images": len(image_prop)
+    }
+
+
+def seed_database(
+    properties=12000,
+    users=2000,
+    renter_share=0.1,
+    reviews_per_property=2.0,
+    wishlists_per_property=0.5,
+    max_images=3,
+    chunk_size=10000,
+    seed=42,
+    progress=None
+):
+    """Bulk-load a synthetic but schema-correct dataset.
+
+    Every chunk of properties (with its reviews, wishlist rows and
+    images) is generated as NumPy columns and committed on its own.
+    Returns row counts per table.
+    """
+    rng = np.random.default_rng(seed)
+    started = time.perf_counter()
+
+    start = (db.session.query(db.func.max(User.id)).scalar() or 0) + 1
+    owners, customers = _insert_users(users, renter_share, start, rng)
+    if not len(owners) or not len(customers):
+        raise ValueError("Need at least one renter and one customer; adjust users / renter_share")
+    db.session.commit()
+
+    totals = {"users": users, "properties": 0, "reviews": 0, "wishlist": 0, "images": 0}
+
+    while totals["properties"] < properties:
+        n = min(chunk_size, properties - totals["properties"])
+
+        counts = _insert_chunk(
+            rng, n, owners, customers,
+            reviews_per_property, wishlists_per_property, max_images
+        )
+        db.session.commit()
+
+        for table, count in counts.items():
+            totals[table] += count
+
+        if progress:
+            progress(totals, time.perf_counter() - started)
+
+    return totals
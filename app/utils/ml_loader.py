@@ -1,31 +1,95 @@
-import os
-import joblib
 import pandas as pd
+from flask import current_app
+from app.instrumentation import timed
+from app.services.model_registry import registry, RENT_MODEL
+from app.utils.cache import TTLCache
 
-BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-MODEL_PATH = os.path.join(BASE_DIR, "ml", "rent_model.pkl")
+# Memoized predictions keyed on (model version, normalized features);
+# sized from PREDICTION_CACHE_SIZE / PREDICTION_CACHE_TTL on use
+_prediction_cache = TTLCache()
+
+
+def _configured_cache():
+    config = current_app.config
+    _prediction_cache.maxsize = config["PREDICTION_CACHE_SIZE"]
+    _prediction_cache.ttl = config["PREDICTION_CACHE_TTL"] or None
+    return _prediction_cache
+
+
+def _on_model_loaded(loaded):
+    if loaded.name == RENT_MODEL:
+        _prediction_cache.clear()
+
+
+registry.add_listener(_on_model_loaded)
 
-model = None
 
 def get_model():
-    global model
-    if model is None:
-        print("Loading model...")
-        model = joblib.load(MODEL_PATH)
-        print(f"MODEL LOADED FROM: {MODEL_PATH}")
-    return model
+    return registry.get(RENT_MODEL).pipeline
 
 
-def predict_rent(city, locality, bedrooms, area_sqft):
-    model_instance = get_model()
+def normalize_features(row):
+    return (
+        str(row["city"]).strip(),
+        str(row["locality"]).strip(),
+        int(row["bedrooms"]),
+        float(row["area_sqft"])
+    )
+
+
+def prediction_cache_stats():
+    return _configured_cache().stats()
 
-    input_data = pd.DataFrame([{
+
+def predict_rent(city, locality, bedrooms, area_sqft):
+    return predict_rents([{
         "city": city,
         "locality": locality,
         "bedrooms": bedrooms,
         "area_sqft": area_sqft
-    }])
+    }])[0]
+
+
+def _score(loaded, feature_rows):
+
+    with timed("model"):
+        if current_app.config["COMPILED_INFERENCE"] and loaded.compiled is not None:
+            columns = {
+                name: [row[i] for row in feature_rows]
+                for i, name in enumerate(loaded.features)
+            }
+            return loaded.compiled.predict(columns)
+
+        input_data = pd.DataFrame(feature_rows, columns=loaded.features)
+        return loaded.pipeline.predict(input_data)
+
+
+def predict_rents(rows):
+    # rows: list of {"city", "locality", "bedrooms", "area_sqft"} dicts.
+    # Cached rows are answered from memory, the rest are scored in one
+    # vectorized call.
+    loaded = registry.get(RENT_MODEL)
+    cache = _configured_cache()
+
+    keys = [(loaded.version,) + normalize_features(row) for row in rows]
+    results = [cache.get(key) for key in keys]
+
+    # Unique feature tuples that still need the model
+    missing = list(dict.fromkeys(
+        key for key, result in zip(keys, results) if result is None
+    ))
+
+    if missing:
+        prediction = _score(loaded, [key[1:] for key in missing])
+
+        scored = {}
+        for key, value in zip(missing, prediction):
+            scored[key] = float(value)
+            cache.set(key, scored[key])
 
-    prediction = model_instance.predict(input_data)
+        results = [
+            scored[key] if result is None else result
+            for key, result in zip(keys, results)
+        ]
 
-    return float(prediction[0])
\ No newline at end of file
+    return results
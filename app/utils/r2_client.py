@@ -1,11 +1,55 @@
 import os
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 
-def get_r2_client():
+MB = 1024 * 1024
+
+# One client per process: boto3 clients are thread-safe, and reusing it
+# keeps credential resolution and the HTTPS connection pool warm
+R2_MAX_POOL_CONNECTIONS = int(os.environ.get("R2_MAX_POOL_CONNECTIONS", 20))
+
+# Photos above the threshold go up as multipart uploads, streamed in
+# chunks from the (disk-spooled) request file
+R2_MULTIPART_THRESHOLD = int(os.environ.get("R2_MULTIPART_THRESHOLD_MB", 8)) * MB
+R2_MULTIPART_CHUNKSIZE = int(os.environ.get("R2_MULTIPART_CHUNKSIZE_MB", 8)) * MB
+R2_MULTIPART_CONCURRENCY = int(os.environ.get("R2_MULTIPART_CONCURRENCY", 4))
+
+_client = None
+_client_lock = threading.Lock()
+
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=R2_MULTIPART_THRESHOLD,
+    multipart_chunksize=R2_MULTIPART_CHUNKSIZE,
+    max_concurrency=R2_MULTIPART_CONCURRENCY,
+    use_threads=True
+)
+
+
+def build_r2_client():
     return boto3.client(
         "s3",
         endpoint_url=os.environ.get("R2_ENDPOINT_URL"),
         aws_access_key_id=os.environ.get("R2_ACCESS_KEY_ID"),
         aws_secret_access_key=os.environ.get("R2_SECRET_ACCESS_KEY"),
-        region_name="auto"
-    )
\ No newline at end of file
+        region_name="auto",
+        config=BotoConfig(
+            max_pool_connections=R2_MAX_POOL_CONNECTIONS,
+            tcp_keepalive=True,
+            connect_timeout=5,
+            read_timeout=60,
+            retries={"max_attempts": 3, "mode": "standard"}
+        )
+    )
+
+
+def get_r2_client():
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = build_r2_client()
+
+    return _client
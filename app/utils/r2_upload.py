@@ -1,19 +1,141 @@
 import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from werkzeug.utils import secure_filename
 import os
-from app.utils.r2_client import get_r2_client
+from app.instrumentation import timed
+from app.utils.r2_client import get_r2_client, TRANSFER_CONFIG
+
+KEY_PREFIX = "rentwise-images/"
+
+# Shared across requests so a worker never has more than this many
+# uploads in flight
+R2_UPLOAD_WORKERS = int(os.environ.get("R2_UPLOAD_WORKERS", 4))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=R2_UPLOAD_WORKERS,
+                    thread_name_prefix="r2-upload"
+                )
+
+    return _executor
+
 
 def upload_to_r2(file):
     r2 = get_r2_client()
 
     filename = f"{uuid.uuid4()}-{secure_filename(file.filename)}"
-    object_key = f"rentwise-images/{filename}"   # KEEP THIS
+    object_key = f"{KEY_PREFIX}{filename}"   # KEEP THIS
 
+    # file.stream is Werkzeug's spooled temp file (on disk past 500 KB),
+    # so large photos are read chunk by chunk rather than held in memory
     r2.upload_fileobj(
-        file,
+        file.stream,
         os.environ.get("R2_BUCKET_NAME"),
         object_key,
-        ExtraArgs={"ContentType": file.content_type}
+        ExtraArgs={"ContentType": file.content_type},
+        Config=TRANSFER_CONFIG
     )
 
-    return f"{os.environ.get('R2_PUBLIC_URL')}/{object_key}"
\ No newline at end of file
+    return f"{os.environ.get('R2_PUBLIC_URL')}/{object_key}"
+
+
+def upload_many_to_r2(files):
+    # Uploads concurrently and returns URLs in input order. If any
+    # upload fails, the ones that succeeded are deleted and the first
+    # error is re-raised, so callers never see a partial set.
+    futures = [_get_executor().submit(upload_to_r2, f) for f in files]
+    with timed("external"):
+        wait(futures)
+
+    urls = [f.result() for f in futures if f.exception() is None]
+    errors = [f.exception() for f in futures if f.exception() is not None]
+
+    if errors:
+        delete_from_r2(urls)
+        raise errors[0]
+
+    return urls
+
+
+def delete_from_r2(urls):
+    keys = [url[url.index(KEY_PREFIX):] for url in urls if KEY_PREFIX in url]
+
+    if not keys:
+        return
+
+    try:
+        with timed("external"):
+            get_r2_client().delete_objects(
+                Bucket=os.environ.get("R2_BUCKET_NAME"),
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True}
+            )
+    except Exception as e:
+        print("R2 CLEANUP ERROR:", e)
+
+
+# =========================================================
+# PRESIGNED (DIRECT-TO-BUCKET) UPLOADS
+# =========================================================
+def property_key_prefix(property_id):
+    return f"{KEY_PREFIX}{property_id}/"
+
+
+def new_property_key(property_id, filename):
+    return f"{property_key_prefix(property_id)}{uuid.uuid4()}-{secure_filename(filename)}"
+
+
+def public_url(object_key):
+    return f"{os.environ.get('R2_PUBLIC_URL')}/{object_key}"
+
+
+def key_from_url(url):
+    prefix = f"{os.environ.get('R2_PUBLIC_URL')}/"
+    return url[len(prefix):] if url.startswith(prefix) else None
+
+
+def presign_upload(object_key, content_type, expires_in):
+    # The client must send the same Content-Type header with its PUT
+    return get_r2_client().generate_presigned_url(
+        "put_object",
+        Params={
+            "Bucket": os.environ.get("R2_BUCKET_NAME"),
+            "Key": object_key,
+            "ContentType": content_type
+        },
+        ExpiresIn=expires_in
+    )
+
+
+def _head(object_key):
+    from botocore.exceptions import ClientError
+
+    try:
+        return get_r2_client().head_object(
+            Bucket=os.environ.get("R2_BUCKET_NAME"),
+            Key=object_key
+        )
+    except ClientError as e:
+        if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+def head_objects(object_keys):
+    # key -> head_object response, or None when the object is missing
+    executor = _get_executor()
+    with timed("external"):
+        return dict(zip(object_keys, executor.map(_head, object_keys)))
+
+
+def delete_keys_from_r2(object_keys):
+    delete_from_r2([public_url(key) for key in object_keys])
@@ -0,0 +1,67 @@
+"""Compare pipeline.predict with the compiled NumPy forest.
+
+    python -m benchmarks.inference_latency [--model app/ml/rent_model.pkl]
+
+Reports median latency of both paths for single rows and a few batch
+sizes.
+"""
+import argparse
+import statistics
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from app.services.compiled_forest import compile_pipeline
+from app.services.market_data import CITY_CONFIG
+from app.services.model_registry import registry, RENT_MODEL
+
+CITIES = list(CITY_CONFIG)
+LOCALITIES = [l for config in CITY_CONFIG.values() for l in config["localities"]]
+
+
+def make_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "city": rng.choice(CITIES, n),
+        "locality": rng.choice(LOCALITIES, n),
+        "bedrooms": rng.integers(1, 5, n),
+        "area_sqft": rng.integers(450, 2500, n).astype(float)
+    })
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=registry.path_for(RENT_MODEL))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    pipeline = joblib.load(args.model)
+    # Also switches the forest to serial prediction (see compile_pipeline);
+    # tests/test_compiled_forest.py checks the two paths agree
+    compiled = compile_pipeline(pipeline)
+
+    print(f"{'rows':>6} {'pipeline ms':>12} {'compiled ms':>12} {'speedup':>8}")
+
+    for n in (1, 10, 100, 1000):
+        df = make_rows(n)
+        columns = {c: df[c].tolist() for c in df.columns}
+
+        pipeline_ms = median_ms(lambda: pipeline.predict(df), args.repeat)
+        compiled_ms = median_ms(lambda: compiled.predict(columns), args.repeat)
+
+        print(f"{n:>6} {pipeline_ms:>12.3f} {compiled_ms:>12.3f} {pipeline_ms / compiled_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
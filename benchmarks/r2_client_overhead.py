@@ -0,0 +1,86 @@
+"""Per-upload overhead of a fresh boto3 client vs the shared one.
+
+    python -m benchmarks.r2_client_overhead [--uploads 200] [--size-kb 200]
+
+Runs against moto's in-process S3 (requirements-dev.txt) unless
+R2_ENDPOINT_URL is set, in which case it uploads to (and cleans up) the
+configured bucket.
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+import uuid
+from contextlib import nullcontext
+
+from app.utils.r2_client import TRANSFER_CONFIG, build_r2_client, get_r2_client
+
+
+def upload(client, bucket, payload):
+    key = f"benchmarks/{uuid.uuid4()}"
+    client.upload_fileobj(io.BytesIO(payload), bucket, key, Config=TRANSFER_CONFIG)
+    return key
+
+
+def run(label, get_client, bucket, payload, uploads):
+    timings = []
+    keys = []
+    for _ in range(uploads):
+        start = time.perf_counter()
+        keys.append(upload(get_client(), bucket, payload))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"{label:>14}: median {statistics.median(timings):7.2f} ms   "
+          f"p95 {sorted(timings)[int(len(timings) * 0.95)]:7.2f} ms")
+    return keys
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    local = not os.environ.get("R2_ENDPOINT_URL")
+
+    if local:
+        try:
+            from moto import mock_aws
+        except ImportError:
+            raise SystemExit(
+                "moto is required without R2_ENDPOINT_URL: pip install -r requirements-dev.txt"
+            )
+        os.environ.setdefault("R2_ACCESS_KEY_ID", "benchmark")
+        os.environ.setdefault("R2_SECRET_ACCESS_KEY", "benchmark")
+        os.environ.setdefault("R2_BUCKET_NAME", "rentwise-benchmark")
+        context = mock_aws()
+    else:
+        context = nullcontext()
+
+    bucket = os.environ["R2_BUCKET_NAME"]
+    payload = os.urandom(args.size_kb * 1024)
+
+    with context:
+        if local:
+            import boto3
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=bucket)
+
+        # Client construction is what the old get_r2_client paid per call
+        start = time.perf_counter()
+        for _ in range(20):
+            build_r2_client()
+        print(f"client construction: {(time.perf_counter() - start) / 20 * 1000:.2f} ms")
+
+        keys = run("new client", build_r2_client, bucket, payload, args.uploads)
+        keys += run("shared client", get_r2_client, bucket, payload, args.uploads)
+
+        for start in range(0, len(keys), 1000):
+            get_r2_client().delete_objects(
+                Bucket=bucket,
+                Delete={"Objects": [{"Key": k} for k in keys[start:start + 1000]], "Quiet": True}
+            )
+
+
+if __name__ == "__main__":
+    main()
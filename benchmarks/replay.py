@@ -0,0 +1,375 @@
+"""Replay a weighted request mix against a seeded database.
+
+    python -m benchmarks.replay [--requests 2000] [--properties 20000]
+        [--database-url sqlite:///...] [--save benchmarks/baselines/x.json]
+        [--compare benchmarks/baselines/x.json]
+
+Seeds a SQLite stand-in (or the given database) with seed_database,
+then sends requests from benchmarks/request_mix.jsonl through Flask's
+test client. Reports p50/p95/p99 latency, throughput and SQL statements
+per request for each entry in the mix. --save writes the report as a
+JSON baseline; --compare diffs the run against one and exits non-zero
+on regressions.
+
+The analysis entries need a rent model. Unless RENT_MODEL_PATH is set,
+train_model.py (seeded, so every run gets the same model) is run once
+into the temp directory and that model is used, never app/ml/.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MIX_PATH = os.path.join(os.path.dirname(__file__), "request_mix.jsonl")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--properties", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--reseed", action="store_true")
+    parser.add_argument("--mix", default=MIX_PATH)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", default=None, help="Write the report to this JSON file.")
+    parser.add_argument("--compare", default=None, help="Baseline JSON to diff against.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown (fraction).")
+    return parser.parse_args()
+
+
+# =========================================================
+# SETUP
+# =========================================================
+def ensure_model():
+    # Baselines must not depend on whatever model is lying in app/ml/
+    if os.getenv("RENT_MODEL_PATH"):
+        return
+
+    model_dir = os.path.join(tempfile.gettempdir(), "rentwise-bench-model")
+    path = os.path.join(model_dir, "rent_model.pkl")
+
+    if not os.path.exists(path):
+        print("Training the benchmark rent model...")
+        os.makedirs(model_dir, exist_ok=True)
+        subprocess.run(
+            [sys.executable, os.path.join(ROOT, "train_model.py")],
+            cwd=model_dir,
+            env=dict(os.environ, PYTHONPATH=ROOT),
+            check=True
+        )
+
+    os.environ["RENT_MODEL_PATH"] = path
+
+
+def make_app(args):
+    # The default SQLite stand-in is seeded once into a template file and
+    # copied fresh for every run, so wishlist writes and stored
+    # predictions from one run don't change the next run's numbers.
+    # An explicit --database-url is used (and mutated) as is.
+    template = None
+    if args.database_url is None:
+        base = os.path.join(tempfile.gettempdir(), f"rentwise-bench-{args.properties}-{args.users}-{args.seed}")
+        template, run_copy = base + ".db", base + "-run.db"
+
+        if os.path.exists(template) and not args.reseed:
+            shutil.copyfile(template, run_copy)
+        elif os.path.exists(run_copy):
+            os.remove(run_copy)
+
+        args.database_url = "sqlite:///" + run_copy
+
+    # DATABASE_URL is read when config is imported, so the app modules
+    # are imported only after it is set
+    os.environ["DATABASE_URL"] = args.database_url
+    # A fresh response cache too, so entries from the last run aren't served
+    os.environ.setdefault("RESPONSE_CACHE_DIR", tempfile.mkdtemp(prefix="rentwise-bench-cache-"))
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark-" + "x" * 32)
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app import create_app, db
+    from app.migrations import upgrade
+    from app.models.property import Property
+    from app.services.synthetic_data import seed_database
+
+    app = create_app()
+
+    with app.app_context():
+        if args.reseed:
+            db.drop_all()
+        upgrade()
+
+        if not db.session.query(Property.id).first():
+            print(f"Seeding {args.properties:,} properties...")
+            seed_database(properties=args.properties, users=args.users, seed=args.seed)
+
+            if template:
+                db.session.remove()
+                db.engine.dispose()
+                shutil.copyfile(db.engine.url.database, template)
+
+    return app
+
+
+def load_fixtures(app):
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models.property import Property
+    from app.models.user import User
+
+    with app.app_context():
+        customers = db.session.execute(
+            db.select(User.id, User.email).where(User.role == "customer").limit(50)
+        ).all()
+        filters = db.session.execute(
+            db.select(Property.city, Property.locality).distinct()
+        ).all()
+        max_id = db.session.query(db.func.max(Property.id)).scalar()
+
+        return {
+            "customers": [
+                (user_id, email, create_access_token(identity=str(user_id)))
+                for user_id, email in customers
+            ],
+            "segments": filters,
+            "max_property_id": max_id
+        }
+
+
+# =========================================================
+# REQUEST MIX
+# =========================================================
+def load_mix(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RequestFactory:
+
+    def __init__(self, mix, fixtures, seed):
+        self.mix = mix
+        self.weights = [entry["weight"] for entry in mix]
+        self.fixtures = fixtures
+        self.rng = random.Random(seed)
+        # (customer, property_id) pairs added this run, for wishlist_remove
+        self.wishlisted = []
+
+    def _fill(self, template, values):
+        if isinstance(template, dict):
+            return {k: self._fill(v, values) for k, v in template.items()}
+        if isinstance(template, str):
+            fields = {name for _, name, _, _ in string.Formatter().parse(template) if name}
+            return template.format(**{k: values[k] for k in fields})
+        return template
+
+    def next(self):
+        entry = self.rng.choices(self.mix, weights=self.weights)[0]
+        customer = self.rng.choice(self.fixtures["customers"])
+        city, locality = self.rng.choice(self.fixtures["segments"])
+
+        wishlisted_id = None
+        if "{wishlisted_property_id}" in entry["path"] and self.wishlisted:
+            customer, wishlisted_id = self.wishlisted.pop(self.rng.randrange(len(self.wishlisted)))
+
+        values = {
+            "property_id": self.rng.randint(1, self.fixtures["max_property_id"]),
+            "wishlisted_property_id": wishlisted_id or self.rng.randint(1, self.fixtures["max_property_id"]),
+            "city": city,
+            "locality": locality,
+            "bedrooms": self.rng.randint(1, 4),
+            "max_price": self.rng.choice([30000, 50000, 80000]),
+            "page": self.rng.randint(1, 20),
+            "email": customer[1]
+        }
+
+        headers = {}
+        if entry.get("auth"):
+            headers["Authorization"] = f"Bearer {customer[2]}"
+
+        return entry, customer, values["property_id"], {
+            "method": entry["method"],
+            "path": self._fill(entry["path"], values),
+            "json": self._fill(entry.get("json"), values),
+            "headers": headers
+        }
+
+
+# =========================================================
+# RUN
+# =========================================================
+def run(app, factory, total, warmup):
+    from app import db
+
+    statements = [0]
+
+    def count_statement(*_):
+        statements[0] += 1
+
+    with app.app_context():
+        engine = db.engine
+    db.event.listen(engine, "before_cursor_execute", count_statement)
+
+    client = app.test_client()
+    samples = defaultdict(list)
+    statuses = defaultdict(Counter)
+
+    started = None
+    for i in range(warmup + total):
+        if i == warmup:
+            samples.clear()
+            statuses.clear()
+            started = time.perf_counter()
+
+        entry, customer, property_id, request = factory.next()
+
+        statements[0] = 0
+        t0 = time.perf_counter()
+        response = client.open(**request)
+        elapsed = time.perf_counter() - t0
+
+        if entry["name"] == "wishlist_add" and response.status_code == 201:
+            factory.wishlisted.append((customer, property_id))
+
+        samples[entry["name"]].append((elapsed, statements[0]))
+        statuses[entry["name"]][response.status_code] += 1
+
+    duration = time.perf_counter() - started
+    db.event.remove(engine, "before_cursor_execute", count_statement)
+
+    return samples, statuses, duration
+
+
+def summarize(timings, counts):
+    ms = np.array(timings) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "count": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "statements_mean": round(float(np.mean(counts)), 2),
+        "statements_max": int(np.max(counts))
+    }
+
+
+def build_report(args, app, samples, statuses, duration):
+    endpoints = {}
+    for name in sorted(samples):
+        timings, counts = zip(*samples[name])
+        endpoints[name] = dict(
+            summarize(timings, counts),
+            statuses={str(code): n for code, n in sorted(statuses[name].items())}
+        )
+
+    all_samples = [s for rows in samples.values() for s in rows]
+    timings, counts = zip(*all_samples)
+
+    with app.app_context():
+        from app import db
+        from app.services.model_registry import registry, RENT_MODEL
+        dialect = db.engine.dialect.name
+        model_version = registry.get(RENT_MODEL).version
+
+    return {
+        "meta": {
+            "requests": args.requests,
+            "properties": args.properties,
+            "users": args.users,
+            "seed": args.seed,
+            "dialect": dialect,
+            "model_version": model_version,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+        },
+        "overall": dict(
+            summarize(timings, counts),
+            throughput_rps=round(len(all_samples) / duration, 1),
+            duration_s=round(duration, 3)
+        ),
+        "endpoints": endpoints
+    }
+
+
+# =========================================================
+# OUTPUT
+# =========================================================
+def print_report(report):
+    header = f"{'endpoint':<22}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'stmts':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in list(report["endpoints"].items()) + [("OVERALL", report["overall"])]:
+        print(
+            f"{name:<22}{row['count']:>6}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+            f"{row['p99_ms']:>10.2f}{row['statements_mean']:>8.1f}"
+        )
+    print(f"\nThroughput: {report['overall']['throughput_rps']} req/s (single client)")
+
+
+def compare(report, baseline, tolerance):
+    # Returns the names that regressed in p95 latency or statement count
+    regressions = []
+
+    print(f"\n{'endpoint':<22}{'p95 base':>10}{'p95 now':>10}{'change':>9}{'stmts base':>12}{'stmts now':>11}")
+    for name, row in report["endpoints"].items():
+        base = baseline["endpoints"].get(name)
+        if base is None:
+            print(f"{name:<22}{'(new)':>10}")
+            continue
+
+        change = row["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+        slower = change > tolerance
+        more_sql = row["statements_mean"] > base["statements_mean"] + 0.5
+
+        flag = "  <-- regression" if slower or more_sql else ""
+        if flag:
+            regressions.append(name)
+
+        print(
+            f"{name:<22}{base['p95_ms']:>10.2f}{row['p95_ms']:>10.2f}{change:>+9.0%}"
+            f"{base['statements_mean']:>12.1f}{row['statements_mean']:>11.1f}{flag}"
+        )
+
+    return regressions
+
+
+def main():
+    args = parse_args()
+    ensure_model()
+    app = make_app(args)
+
+    factory = RequestFactory(load_mix(args.mix), load_fixtures(app), args.seed)
+    samples, statuses, duration = run(app, factory, args.requests, args.warmup)
+
+    report = build_report(args, app, samples, statuses, duration)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Saved {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\nRegressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
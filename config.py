@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 from datetime import timedelta
 
@@ -20,10 +21,93 @@ class Config:
 
     
     SQLALCHEMY_ENGINE_OPTIONS = {
-        "pool_pre_ping": True,
-        "connect_args": {
-            "sslmode": "require"
-        }
+        "pool_pre_ping": True
     }
 
-    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
\ No newline at end of file
+    # sslmode is a libpq option; SQLite stand-ins (benchmarks) reject it
+    if database_url and database_url.startswith("postgresql"):
+        SQLALCHEMY_ENGINE_OPTIONS["connect_args"] = {
+            "sslmode": os.getenv("DATABASE_SSLMODE", "require")
+        }
+
+    JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+
+    # Largest request body (listing photos included) Flask will accept
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_MB", 100)) * 1024 * 1024
+
+    # Presigned direct-to-R2 image uploads
+    PRESIGNED_UPLOAD_EXPIRES = int(os.getenv("PRESIGNED_UPLOAD_EXPIRES", 900))
+    PRESIGNED_UPLOAD_MAX_FILES = int(os.getenv("PRESIGNED_UPLOAD_MAX_FILES", 20))
+    PRESIGNED_UPLOAD_MAX_MB = int(os.getenv("PRESIGNED_UPLOAD_MAX_MB", 25))
+
+    # Background WebP derivatives (thumbnail / medium) for listing images
+    IMAGE_DERIVATIVES_ENABLED = os.getenv("IMAGE_DERIVATIVES_ENABLED", "true").lower() == "true"
+
+    # Background jobs: "thread" runs them in-process, "database" queues
+    # them in the jobs table for worker.py
+    JOB_BACKEND = os.getenv("JOB_BACKEND", "thread")
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+    JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", 5))
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", 300))
+    JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", 1.0))
+    JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", 10))
+
+    # Bulk CSV / JSONL listing import
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", 1000))
+    BULK_IMPORT_MAX_MB = int(os.getenv("BULK_IMPORT_MAX_MB", 500))
+
+    # Request instrumentation: Server-Timing, /metrics, slow-query log
+    INSTRUMENTATION_ENABLED = os.getenv("INSTRUMENTATION_ENABLED", "true").lower() == "true"
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 200))
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+    # Serve /metrics without a token (only behind a private network)
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+
+    # Opt-in sampling profiler (per request via X-Profile-Token, or a
+    # random PROFILING_SAMPLE_RATE fraction of traffic)
+    PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+    PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+    PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", 2))
+    PROFILING_DIR = os.getenv("PROFILING_DIR", os.path.join(tempfile.gettempdir(), "rentwise-profiles"))
+    PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", 200))
+
+    # Cache for public GET /properties/all and /properties/<id>.
+    # "filesystem" shares entries and invalidations between the gunicorn
+    # workers and worker.py on one host. "memory" is per process: writes
+    # made by other workers or job processes are only seen once an entry
+    # expires (RESPONSE_CACHE_TTL), so use it with a single process only.
+    # Hosts that don't share RESPONSE_CACHE_DIR can't see each other's
+    # invalidations either. "none" turns the cache off.
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "filesystem")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 2000))
+    RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "rentwise-response-cache"))
+    RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", 0))
+
+    # Seconds a worker may serve its cached /properties/filters map
+    FILTERS_CACHE_TTL = int(os.getenv("FILTERS_CACHE_TTL", 300))
+
+    # Per-process memo of model predictions (0 TTL = until the model changes)
+    PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", 10000))
+    PREDICTION_CACHE_TTL = int(os.getenv("PREDICTION_CACHE_TTL", 0))
+
+    # Score with the compiled NumPy forest when the artifact supports it
+    COMPILED_INFERENCE = os.getenv("COMPILED_INFERENCE", "true").lower() == "true"
+
+    # Max property ids + raw rows accepted by POST /analysis/batch
+    ANALYSIS_BATCH_LIMIT = int(os.getenv("ANALYSIS_BATCH_LIMIT", 1000))
+
+    # Max asked rents per POST /analysis/<id>/what-if
+    WHAT_IF_LIMIT = int(os.getenv("WHAT_IF_LIMIT", 200))
+
+    # Serve comparables from the in-memory segment store (segment_stats)
+    # and rebuild it from the database every SEGMENT_STATS_TTL seconds
+    SEGMENT_STATS_ENABLED = os.getenv("SEGMENT_STATS_ENABLED", "true").lower() == "true"
+    SEGMENT_STATS_TTL = int(os.getenv("SEGMENT_STATS_TTL", 600))
+
+    # Answer comparables from persisted quantile sketches instead of raw
+    # rents (rebuild them with `flask build-market-sketches`)
+    MARKET_SKETCHES_ENABLED = os.getenv("MARKET_SKETCHES_ENABLED", "false").lower() == "true"
\ No newline at end of file
@@ -0,0 +1,11 @@
+# Picked up automatically by `gunicorn run:app`.
+
+# Import the app in the master process so everything it loads is
+# shared copy-on-write by the forked workers.
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master after the app is imported, before workers fork
+    from app.services.model_registry import registry
+    registry.preload()
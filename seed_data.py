@@ -1,152 +1,70 @@
-import random
-from datetime import datetime, timedelta
+import argparse
+from flask import current_app
 from app import create_app, db
-from app.models.property import Property
+from app.migrations import upgrade
+from app.services.market_sketches import rebuild_market_sketches
+from app.services.synthetic_data import seed_database
 
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
 
-CITIES = {
-    "Hyderabad": {
-        "localities": {
-            "Gachibowli": 45,
-            "Hitech City": 50,
-            "Kondapur": 38,
-            "Madhapur": 48,
-            "Manikonda": 30,
-            "Kukatpally": 28,
-        }
-    },
-    "Bangalore": {
-        "localities": {
-            "Whitefield": 55,
-            "Electronic City": 32,
-            "Indiranagar": 70,
-            "Koramangala": 65,
-            "HSR Layout": 52,
-            "Marathahalli": 40,
-        }
-    },
-    "Mumbai": {
-        "localities": {
-            "Andheri": 85,
-            "Bandra": 120,
-            "Powai": 95,
-            "Goregaon": 75,
-            "Thane": 60,
-            "Navi Mumbai": 55,
-        }
-    },
-    "Delhi": {
-        "localities": {
-            "Saket": 60,
-            "Dwarka": 40,
-            "Rohini": 35,
-            "Lajpat Nagar": 55,
-            "Karol Bagh": 45,
-        }
-    },
-    "Chennai": {
-        "localities": {
-            "OMR": 35,
-            "Adyar": 55,
-            "Velachery": 38,
-            "Anna Nagar": 50,
-            "T Nagar": 48,
-        }
-    },
-    "Pune": {
-        "localities": {
-            "Hinjewadi": 30,
-            "Kharadi": 40,
-            "Viman Nagar": 42,
-            "Baner": 45,
-            "Wakad": 28,
-        }
-    }
-}
-
-FURNISHING_MULTIPLIER = {
-    "unfurnished": 1.0,
-    "semi": 1.15,
-    "full": 1.30
-}
-
-BHK_SQFT_RANGE = {
-    1: (400, 700),
-    2: (700, 1200),
-    3: (1100, 1800),
-    4: (1600, 2500)
-}
-
-RECORDS_PER_CITY = 2000
+DEFAULT_PROPERTIES = 12000
+DEFAULT_USERS = 2000
+CHUNK_SIZE = 10000
 
 
 # -----------------------------
 # SEED LOGIC
 # -----------------------------
 
-def generate_property(city, locality, base_price_per_sqft):
-    bhk = random.choice([1, 2, 3, 4])
-    sqft_min, sqft_max = BHK_SQFT_RANGE[bhk]
-    sqft = random.randint(sqft_min, sqft_max)
-
-    furnishing = random.choice(["unfurnished", "semi", "full"])
-    multiplier = FURNISHING_MULTIPLIER[furnishing]
-
-    # base rent calculation
-    rent = sqft * base_price_per_sqft * multiplier
-
-    # controlled noise ±10%
-    noise = random.uniform(0.9, 1.1)
-    rent *= noise
-
-    rent = round(rent, -2)  # round to nearest 100
-
-    deposit = rent * random.randint(3, 6)
-
-    created_at = datetime.utcnow() - timedelta(days=random.randint(0, 365))
-
-    return Property(
-        city=city,
-        locality=locality,
-        bhk=bhk,
-        sqft=sqft,
-        rent=rent,
-        deposit=deposit,
-        furnishing=furnishing,
-        created_at=created_at
+def parse_args():
+    parser = argparse.ArgumentParser(description="Bulk-load synthetic RentWise data.")
+    parser.add_argument("--properties", type=int, default=DEFAULT_PROPERTIES)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--reviews-per-property", type=float, default=2.0)
+    parser.add_argument("--wishlists-per-property", type=float, default=0.5)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate every table first.")
+    return parser.parse_args()
+
+
+def report(totals, elapsed):
+    print(
+        f"  {totals['properties']:,} properties, {totals['reviews']:,} reviews, "
+        f"{totals['wishlist']:,} wishlist rows, {totals['images']:,} images "
+        f"({elapsed:.1f}s)"
     )
 
 
 def seed():
+    args = parse_args()
     app = create_app()
 
     with app.app_context():
-        print("Clearing existing data...")
-        db.session.query(Property).delete()
-        db.session.commit()
+        if args.reset:
+            print("Dropping existing tables...")
+            db.drop_all()
 
-        total_records = 0
+        upgrade()
 
         print("Generating data...")
+        totals = seed_database(
+            properties=args.properties,
+            users=args.users,
+            reviews_per_property=args.reviews_per_property,
+            wishlists_per_property=args.wishlists_per_property,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+            progress=report
+        )
 
-        for city, city_data in CITIES.items():
-            localities = city_data["localities"]
-
-            for _ in range(RECORDS_PER_CITY):
-                locality = random.choice(list(localities.keys()))
-                base_price = localities[locality]
-
-                property_obj = generate_property(city, locality, base_price)
-                db.session.add(property_obj)
-                total_records += 1
-
-        db.session.commit()
+        if current_app.config["MARKET_SKETCHES_ENABLED"]:
+            print(f"Rebuilt {rebuild_market_sketches()} market sketches.")
 
-        print(f"Seeding complete. Total records inserted: {total_records}")
+        print(f"Seeding complete. Total records inserted: {sum(totals.values()):,}")
 
 
 if __name__ == "__main__":
-    seed()
\ No newline at end of file
+    seed()
@@ -0,0 +1,203 @@
+import os
+from contextlib import contextmanager
+
+# config.Config reads the environment at import time
+os.environ.setdefault("JWT_SECRET_KEY", "test-" + "x" * 32)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("R2_BUCKET_NAME", "rentwise-test")
+os.environ.setdefault("R2_PUBLIC_URL", "https://images.test")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app, db
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # Queue jobs as rows; nothing runs them during a test
+    JOB_BACKEND = "database"
+    IMAGE_DERIVATIVES_ENABLED = False
+    SEGMENT_STATS_ENABLED = False
+    PROFILING_ENABLED = False
+    RESPONSE_CACHE_BACKEND = "memory"
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    # make_app(**config) -> a fresh app on its own SQLite file
+    apps = []
+
+    def factory(**overrides):
+        config = type("Config", (TestConfig,), dict(
+            dict(
+                SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path}/app-{len(apps)}.db",
+                RESPONSE_CACHE_DIR=str(tmp_path / f"response-cache-{len(apps)}")
+            ),
+            **overrides
+        ))
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+        apps.append(app)
+        return app
+
+    yield factory
+
+    for app in apps:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+# =========================================================
+# DATA HELPERS
+# =========================================================
+def add_user(email, role="customer"):
+    from app.models.user import User
+
+    user = User(email=email, role=role)
+    user.set_password("password")
+    db.session.add(user)
+    db.session.commit()
+    return user.id
+
+
+def add_properties(owner_id, n, **fields):
+    from app.models.property import Property
+
+    properties = [
+        Property(**dict(
+            dict(
+                city="Hyderabad",
+                locality=("Madhapur", "Gachibowli")[i % 2],
+                bedrooms=1 + i % 4,
+                area_sqft=800 + 10 * i,
+                rent=20000 + 500 * i,
+                owner_id=owner_id
+            ),
+            **fields
+        ))
+        for i in range(n)
+    ]
+    db.session.add_all(properties)
+    db.session.commit()
+    return [p.id for p in properties]
+
+
+def auth_headers(app, user_id):
+    from flask_jwt_extended import create_access_token
+
+    with app.app_context():
+        return {"Authorization": f"Bearer {create_access_token(identity=str(user_id))}"}
+
+
+@contextmanager
+def count_statements(app):
+    # Yields a list that collects every SQL statement run inside the block
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+# =========================================================
+# MODEL
+# =========================================================
+@pytest.fixture(scope="session")
+def rent_model_file(tmp_path_factory):
+    # A small forest with the train_model.py pipeline shape
+    import joblib
+    import numpy as np
+    import pandas as pd
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder
+
+    rng = np.random.default_rng(0)
+    n = 2000
+    X = pd.DataFrame({
+        "city": rng.choice(["Hyderabad", "Pune", "Mumbai"], n),
+        "locality": rng.choice(["Madhapur", "Gachibowli", "Baner", "Andheri"], n),
+        "bedrooms": rng.integers(1, 5, n),
+        "area_sqft": rng.integers(450, 2500, n).astype(float)
+    })
+    y = X["area_sqft"] * 25 + X["bedrooms"] * 3000 + rng.integers(-2000, 2000, n)
+
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([
+            ("cat", OneHotEncoder(handle_unknown="ignore"), ["city", "locality"]),
+            ("num", "passthrough", ["bedrooms", "area_sqft"])
+        ])),
+        ("regressor", RandomForestRegressor(
+            n_estimators=20, max_depth=8, min_samples_leaf=2, random_state=42, n_jobs=-1
+        ))
+    ])
+    pipeline.fit(X, y)
+
+    path = tmp_path_factory.mktemp("model") / "rent_model.pkl"
+    joblib.dump(pipeline, path)
+    return path
+
+
+@pytest.fixture
+def rent_model(rent_model_file, monkeypatch):
+    # Points the process-wide registry at the test model for one test
+    from app.services.model_registry import registry, RENT_MODEL
+
+    monkeypatch.setenv("RENT_MODEL_PATH", str(rent_model_file))
+    monkeypatch.setattr(registry, "_models", {})
+    return registry.get(RENT_MODEL)
+
+
+# =========================================================
+# R2 (MOTO)
+# =========================================================
+@pytest.fixture
+def r2_bucket(monkeypatch):
+    # An in-process S3 bucket behind the shared R2 client; yields a
+    # function listing the object keys currently stored
+    import boto3
+    from moto import mock_aws
+    from app.utils import r2_client
+
+    monkeypatch.delenv("R2_ENDPOINT_URL", raising=False)
+    monkeypatch.setattr(r2_client, "_client", None)
+
+    with mock_aws():
+        client = r2_client.get_r2_client()
+        bucket = os.environ["R2_BUCKET_NAME"]
+        # The R2 client's "auto" region has no location constraint in moto
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=bucket)
+
+        def keys():
+            response = client.list_objects_v2(Bucket=bucket)
+            return sorted(o["Key"] for o in response.get("Contents", []))
+
+        yield keys
+
+    monkeypatch.setattr(r2_client, "_client", None)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.ml_loader import predict_rents
+
+
+def make_rows(n, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        # "Chennai" / "Velachery" were never seen in training
+        "city": rng.choice(["Hyderabad", "Pune", "Mumbai", "Chennai"], n),
+        "locality": rng.choice(["Madhapur", "Gachibowli", "Baner", "Andheri", "Velachery"], n),
+        "bedrooms": rng.integers(1, 5, n),
+        "area_sqft": rng.integers(450, 2500, n).astype(float)
+    })
+
+
+def test_registry_predicts_serially(rent_model):
+    assert rent_model.compiled is not None
+    assert rent_model.pipeline.steps[-1][1].n_jobs == 1
+
+
+def test_compiling_leaves_the_pipeline_alone(rent_model_file):
+    import joblib
+    from app.services.compiled_forest import compile_pipeline
+
+    pipeline = joblib.load(rent_model_file)
+
+    assert compile_pipeline(pipeline) is not None
+    assert pipeline.steps[-1][1].n_jobs == -1
+
+
+def test_compiled_forest_matches_pipeline(rent_model):
+    rows = make_rows(5000)
+
+    expected = rent_model.pipeline.predict(rows)
+    actual = rent_model.compiled.predict({c: rows[c].tolist() for c in rows.columns})
+
+    assert np.array_equal(expected, actual)
+
+
+def test_prediction_paths_agree(make_app, rent_model):
+    rows = make_rows(200, seed=2).to_dict("records")
+    compiled = make_app(COMPILED_INFERENCE=True, PREDICTION_CACHE_SIZE=0)
+    fallback = make_app(COMPILED_INFERENCE=False, PREDICTION_CACHE_SIZE=0)
+
+    with compiled.app_context():
+        expected = predict_rents(rows)
+    with fallback.app_context():
+        assert predict_rents(rows) == expected
@@ -0,0 +1,72 @@
+import io
+
+import pytest
+
+from app import db
+from app.models.property import Property
+from app.models.property_image import PropertyImage
+from app.routes import property_routes
+from tests.conftest import add_user, auth_headers
+
+FORM = {"city": "hyderabad", "locality": "madhapur", "bedrooms": "2", "area_sqft": "1000", "rent": "25000"}
+
+
+@pytest.fixture
+def owner_id(app):
+    with app.app_context():
+        return add_user("owner@example.com", role="renter")
+
+
+def post_listing(app, client, owner_id, n_images=2):
+    data = dict(FORM, images=[
+        (io.BytesIO(b"\xff\xd8 photo %d" % i), f"photo-{i}.jpg", "image/jpeg")
+        for i in range(n_images)
+    ])
+    return client.post(
+        "/properties/",
+        data=data,
+        content_type="multipart/form-data",
+        headers=auth_headers(app, owner_id)
+    )
+
+
+def test_create_uploads_images(app, client, owner_id, r2_bucket):
+    response = post_listing(app, client, owner_id)
+
+    assert response.status_code == 201
+    assert len(r2_bucket()) == 2
+
+    with app.app_context():
+        urls = sorted(i.image_filename for i in PropertyImage.query)
+        assert [url.rsplit("/", 2)[-1] for url in urls] == [key.rsplit("/", 1)[-1] for key in r2_bucket()]
+
+
+def test_failed_commit_deletes_uploaded_images(app, client, owner_id, r2_bucket, monkeypatch):
+    def fail_commit():
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(db.session, "commit", fail_commit)
+    response = post_listing(app, client, owner_id)
+    monkeypatch.undo()
+
+    assert response.status_code == 500
+    assert r2_bucket() == []
+
+    with app.app_context():
+        assert Property.query.count() == 0
+
+
+@pytest.mark.parametrize("step", ["schedule_prediction", "schedule_derivatives"])
+def test_follow_up_failure_keeps_committed_listing(app, client, owner_id, r2_bucket, monkeypatch, step):
+    def fail(*args, **kwargs):
+        raise RuntimeError("queue unavailable")
+
+    monkeypatch.setattr(property_routes, step, fail)
+    response = post_listing(app, client, owner_id)
+
+    assert response.status_code == 201
+    assert len(r2_bucket()) == 2
+
+    with app.app_context():
+        assert Property.query.count() == 1
+        assert PropertyImage.query.count() == 2
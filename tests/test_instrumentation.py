@@ -0,0 +1,27 @@
+import logging
+
+import pytest
+
+from app import db
+
+
+@pytest.mark.parametrize("overrides, headers, status", [
+    ({}, {}, 403),
+    ({"METRICS_PUBLIC": True}, {}, 200),
+    ({"METRICS_TOKEN": "secret"}, {}, 403),
+    ({"METRICS_TOKEN": "secret", "METRICS_PUBLIC": True}, {}, 403),
+    ({"METRICS_TOKEN": "secret"}, {"Authorization": "Bearer secret"}, 200),
+])
+def test_metrics_access(make_app, overrides, headers, status):
+    app = make_app(INSTRUMENTATION_ENABLED=True, **overrides)
+
+    assert app.test_client().get("/metrics", headers=headers).status_code == status
+
+
+def test_slow_queries_are_logged(make_app, caplog):
+    app = make_app(INSTRUMENTATION_ENABLED=True, SLOW_QUERY_MS=0.000001)
+
+    with app.app_context(), caplog.at_level(logging.WARNING):
+        db.session.execute(db.text("SELECT 1"))
+
+    assert any(r.getMessage().startswith("SLOW QUERY") for r in caplog.records)
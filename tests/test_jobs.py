@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.migrations import upgrade
+from app.models.job import Job
+from app.models.user import User
+from app.services import jobs
+from app.services.jobs import DatabaseBackend, ThreadPoolBackend, enqueue
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    # Registers a "noop" job that records its payloads
+    calls = []
+    monkeypatch.setitem(jobs.HANDLERS, "noop", lambda **payload: calls.append(payload))
+    return calls
+
+
+def test_database_enqueue_joins_the_callers_transaction(app, handler):
+    with app.app_context():
+        db.session.add(User(email="owner@example.com", password_hash="x", role="renter"))
+        db.session.flush()
+        enqueue("noop", idempotency_key="k", n=1)
+        db.session.rollback()
+        assert (User.query.count(), Job.query.count()) == (0, 0)
+
+        db.session.add(User(email="owner@example.com", password_hash="x", role="renter"))
+        db.session.flush()
+        enqueue("noop", idempotency_key="k", n=1)
+        db.session.commit()
+        assert (User.query.count(), Job.query.count()) == (1, 1)
+
+
+def test_idempotency_key_only_dedupes_active_jobs(app, handler):
+    backend = DatabaseBackend(app)
+
+    with app.app_context():
+        assert enqueue("noop", idempotency_key="k", n=1)
+        assert not enqueue("noop", idempotency_key="k", n=2)
+        db.session.commit()
+
+        assert backend.run_once(10) == 1
+        assert handler == [{"n": 1}]
+
+        # The finished job no longer holds the key
+        assert enqueue("noop", idempotency_key="k", n=3)
+        db.session.commit()
+        assert [job.status for job in Job.query.order_by(Job.id)] == ["done", "queued"]
+
+
+def test_thread_backend_releases_key_when_job_finishes(app, monkeypatch):
+    gate = threading.Event()
+    runs = []
+    monkeypatch.setitem(jobs.HANDLERS, "noop", lambda: runs.append(gate.wait(5)))
+    backend = ThreadPoolBackend(app)
+
+    try:
+        assert backend.enqueue("noop", {}, idempotency_key="k")
+        assert not backend.enqueue("noop", {}, idempotency_key="k")
+
+        gate.set()
+        deadline = time.monotonic() + 5
+        while backend._active and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert backend.enqueue("noop", {}, idempotency_key="k")
+    finally:
+        backend.shutdown()
+
+    assert runs == [True, True]
+
+
+def test_upgrade_drops_table_wide_idempotency_constraint(make_app, handler):
+    app = make_app()
+
+    with app.app_context():
+        # The jobs table as first shipped: UNIQUE on the column itself
+        Job.__table__.drop(db.engine)
+        db.session.execute(text(
+            "CREATE TABLE jobs (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "payload TEXT NOT NULL, idempotency_key VARCHAR(200) UNIQUE, status VARCHAR(20) NOT NULL, "
+            "attempts INTEGER NOT NULL, max_attempts INTEGER NOT NULL, run_after DATETIME NOT NULL, "
+            "locked_at DATETIME, last_error TEXT, created_at DATETIME, finished_at DATETIME)"
+        ))
+        db.session.execute(text("CREATE INDEX ix_jobs_status_run_after ON jobs (status, run_after)"))
+        db.session.execute(text(
+            "INSERT INTO jobs (name, payload, idempotency_key, status, attempts, max_attempts, run_after) "
+            "VALUES ('noop', '{}', 'k', 'done', 1, 3, CURRENT_TIMESTAMP)"
+        ))
+        db.session.commit()
+
+        upgrade()
+        upgrade()
+
+        assert enqueue("noop", idempotency_key="k")
+        assert not enqueue("noop", idempotency_key="k")
+        db.session.commit()
+        assert Job.query.count() == 2
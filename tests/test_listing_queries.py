@@ -0,0 +1,86 @@
+import pytest
+
+from app import db
+from app.models.property_image import PropertyImage
+from app.models.review import Review
+from app.models.wishlist import Wishlist
+from tests.conftest import add_properties, add_user, auth_headers, count_statements
+
+
+def seed_listing(n):
+    # n listings, each with images, a review and (every other one) a wishlist row
+    owner_id = add_user("owner@example.com", role="renter")
+    customer_id = add_user("customer@example.com")
+    property_ids = add_properties(owner_id, n)
+
+    for i, property_id in enumerate(property_ids):
+        db.session.add_all([
+            PropertyImage(image_filename=f"https://images.test/{i}-a.jpg", property_id=property_id),
+            PropertyImage(image_filename=f"https://images.test/{i}-b.jpg", property_id=property_id),
+            Review(rating=1 + i % 5, comment="ok", user_id=customer_id, property_id=property_id)
+        ])
+        if i % 2 == 0:
+            db.session.add(Wishlist(user_id=customer_id, property_id=property_id))
+
+    db.session.commit()
+    return customer_id
+
+
+def listing_statements(make_app, n, path):
+    app = make_app()
+    with app.app_context():
+        customer_id = seed_listing(n)
+
+    client = app.test_client()
+    headers = auth_headers(app, customer_id)
+
+    with count_statements(app) as statements:
+        response = client.get(path, headers=headers)
+
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize("path", [
+    "/properties/all?per_page=50",
+    "/properties/all?per_page=50&cursor=",
+    "/properties/wishlist",
+])
+def test_listing_query_count_does_not_grow_with_page_size(make_app, path):
+    small, _ = listing_statements(make_app, 3, path)
+    large, body = listing_statements(make_app, 30, path)
+
+    properties = body if isinstance(body, list) else body["properties"]
+    assert len(properties) >= 15
+    assert 0 < large == small
+
+
+def test_listing_flags_wishlisted_cards(make_app):
+    _, body = listing_statements(make_app, 4, "/properties/all?per_page=50")
+
+    flags = {p["id"]: p["is_in_wishlist"] for p in body["properties"]}
+    assert sorted(pid for pid, flagged in flags.items() if flagged) == [1, 3]
+
+
+@pytest.mark.parametrize("sort", ["newest", "low", "high"])
+def test_keyset_pages_cover_every_listing_once(app, client, sort):
+    from datetime import datetime
+
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        # Ties on both sort keys force the id tiebreak
+        tied = datetime(2024, 5, 1, 12, 30, 15, 250000)
+        expected = set(add_properties(owner_id, 10, created_at=tied, rent=25000))
+        expected |= set(add_properties(owner_id, 13))
+
+    seen = []
+    cursor = ""
+    for _ in range(20):
+        body = client.get(f"/properties/all?sort={sort}&per_page=4&cursor={cursor}").get_json()
+        seen += [p["id"] for p in body["properties"]]
+        if not body["has_more"]:
+            break
+        cursor = body["next_cursor"]
+
+    assert len(seen) == len(set(seen))
+    assert set(seen) == expected
@@ -0,0 +1,82 @@
+import pytest
+
+from app import db
+from app.models.job import Job
+from app.models.market_sketch import MarketSketch
+from app.models.property import Property
+from app.services import market_sketches
+from tests.conftest import add_properties, add_user, auth_headers
+
+
+@pytest.fixture
+def sketch_app(make_app):
+    app = make_app(MARKET_SKETCHES_ENABLED=True)
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        # rents 20000, 20500, 21000, 21500 in one segment
+        ids = add_properties(owner_id, 4, locality="Madhapur", bedrooms=2, area_sqft=1000)
+        market_sketches.rebuild_market_sketches()
+    app.owner_id, app.property_ids = owner_id, ids
+    return app
+
+
+def _segment():
+    return market_sketches.segment_sketch("Hyderabad", "Madhapur", 2, 1000)
+
+
+def _dirty_rows():
+    return MarketSketch.query.filter_by(dirty=True).count()
+
+
+def test_rent_edit_is_visible_before_the_refresh(sketch_app):
+    client = sketch_app.test_client()
+    response = client.put(
+        f"/properties/{sketch_app.property_ids[0]}",
+        json={"rent": 90000},
+        headers=auth_headers(sketch_app, sketch_app.owner_id)
+    )
+    assert response.status_code == 200
+
+    with sketch_app.app_context():
+        assert _dirty_rows() == 1
+        assert Job.query.filter_by(name="refresh_market_sketches").count() == 1
+        assert (_segment().count, _segment().min, _segment().max) == (4, 20500, 90000)
+
+        assert market_sketches.refresh_stale_sketches() == 1
+        assert _dirty_rows() == 0
+        assert (_segment().count, _segment().max) == (4, 90000)
+
+
+def test_delete_drops_the_rent(sketch_app):
+    client = sketch_app.test_client()
+    headers = auth_headers(sketch_app, sketch_app.owner_id)
+    for property_id in sketch_app.property_ids[:3]:
+        assert client.delete(f"/properties/{property_id}", headers=headers).status_code == 200
+
+    with sketch_app.app_context():
+        assert (_segment().count, _segment().min) == (1, 21500)
+
+        market_sketches.refresh_stale_sketches()
+        assert _segment().count == 1
+
+
+def test_moving_a_listing_updates_both_segments(sketch_app):
+    client = sketch_app.test_client()
+    response = client.put(
+        f"/properties/{sketch_app.property_ids[0]}",
+        json={"area_sqft": 2000},
+        headers=auth_headers(sketch_app, sketch_app.owner_id)
+    )
+    assert response.status_code == 200
+
+    with sketch_app.app_context():
+        moved = market_sketches.segment_sketch("Hyderabad", "Madhapur", 2, 2000)
+        assert (moved.count, moved.min) == (1, 20000)
+        assert (_segment().count, _segment().min) == (3, 20500)
+
+        # The last listing leaving a segment removes its row
+        db.session.delete(db.session.get(Property, sketch_app.property_ids[0]))
+        market_sketches.record_change(before=("Hyderabad", "Madhapur", 2, 2000, 20000))
+        db.session.commit()
+        market_sketches.refresh_stale_sketches()
+        assert market_sketches.segment_sketch("Hyderabad", "Madhapur", 2, 2000) is None
@@ -0,0 +1,106 @@
+from app import db
+from app.utils.ml_loader import prediction_cache_stats, predict_rents
+from tests.conftest import add_properties, add_user
+
+ROWS = [
+    {"city": "Hyderabad", "locality": "Madhapur", "bedrooms": 2, "area_sqft": 1000},
+    {"city": "Pune", "locality": "Baner", "bedrooms": 3, "area_sqft": 1400},
+    {"city": "Mumbai", "locality": "Andheri", "bedrooms": 1, "area_sqft": 600},
+]
+
+
+def test_prediction_cache_is_sized_from_config(make_app, rent_model):
+    app = make_app(PREDICTION_CACHE_SIZE=2, PREDICTION_CACHE_TTL=60)
+
+    with app.app_context():
+        first = predict_rents(ROWS)
+        stats = prediction_cache_stats()
+
+        assert (stats["size"], stats["maxsize"]) == (2, 2)
+
+        # The last two rows are still cached and come back unchanged
+        assert predict_rents(ROWS[1:]) == first[1:]
+        assert prediction_cache_stats()["hits"] - stats["hits"] == 2
+
+
+
+# =========================================================
+# STORED PREDICTIONS
+# =========================================================
+def _prediction_count(property_id):
+    from app.models.prediction import Prediction
+
+    return Prediction.query.filter_by(property_id=property_id).count()
+
+
+def test_prediction_is_stored_once_and_reused(app, rent_model):
+    from app.models.property import Property
+    from app.services.prediction_service import predict_for_property
+
+    with app.app_context():
+        property_id = add_properties(add_user("owner@example.com", role="renter"), 1)[0]
+        property_obj = db.session.get(Property, property_id)
+
+        first = predict_for_property(property_obj)
+        assert predict_for_property(property_obj) == first
+        assert _prediction_count(property_id) == 1
+
+
+def test_prediction_is_recomputed_when_listing_or_model_changes(app, rent_model):
+    from app.models.property import Property
+    from app.services.prediction_service import predict_for_property
+
+    with app.app_context():
+        property_id = add_properties(add_user("owner@example.com", role="renter"), 1)[0]
+        property_obj = db.session.get(Property, property_id)
+        predict_for_property(property_obj)
+
+        property_obj.area_sqft += 400
+        db.session.commit()
+        predict_for_property(property_obj)
+        assert _prediction_count(property_id) == 2
+
+        rent_model.version = "retrained"
+        predict_for_property(property_obj)
+        assert _prediction_count(property_id) == 3
+
+
+def test_recompute_predictions_covers_every_batch(app, rent_model):
+    from app.models.prediction import Prediction
+    from app.services.prediction_service import recompute_predictions
+
+    with app.app_context():
+        add_properties(add_user("owner@example.com", role="renter"), 7)
+
+        assert recompute_predictions(batch_size=3) == 7
+        assert recompute_predictions(batch_size=3) == 0
+        assert recompute_predictions(batch_size=3, force=True) == 7
+        assert Prediction.query.count() == 14
+
+
+def test_listing_cache_survives_an_unchanged_badge(app, rent_model):
+    from app.models.property import Property
+    from app.services.prediction_service import predict_for_property
+
+    with app.app_context():
+        property_id = add_properties(add_user("owner@example.com", role="renter"), 1)[0]
+        property_obj = db.session.get(Property, property_id)
+        predict_for_property(property_obj)
+
+    client = app.test_client()
+    client.get("/properties/all")
+
+    with app.app_context():
+        rent_model.version = "retrained"
+        predict_for_property(db.session.get(Property, property_id))
+
+    # Same forest under a new version: same estimate, same badge
+    assert client.get("/properties/all").headers["X-Cache"] == "HIT"
+
+    with app.app_context():
+        property_obj = db.session.get(Property, property_id)
+        property_obj.area_sqft = 500
+        db.session.commit()
+        predict_for_property(property_obj)
+
+    assert client.get("/properties/all").headers["X-Cache"] == "MISS"
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from app.utils.r2_client import get_r2_client
+from tests.conftest import add_properties, add_user, auth_headers
+
+
+@pytest.fixture
+def listing(app):
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        property_id = add_properties(owner_id, 1)[0]
+    return property_id, auth_headers(app, owner_id)
+
+
+def test_presign_and_finalize(client, listing, r2_bucket):
+    property_id, headers = listing
+
+    response = client.post(
+        f"/properties/{property_id}/images/presign",
+        json={"files": [{"filename": "front.jpg", "content_type": "image/jpeg"}]},
+        headers=headers
+    )
+    assert response.status_code == 200
+    upload = response.get_json()["uploads"][0]
+
+    # Stand-in for the browser's PUT to upload_url
+    get_r2_client().put_object(
+        Bucket=os.environ["R2_BUCKET_NAME"], Key=upload["key"], Body=b"jpeg", ContentType="image/jpeg"
+    )
+
+    response = client.post(
+        f"/properties/{property_id}/images/finalize",
+        json={"keys": [upload["key"]]},
+        headers=headers
+    )
+    assert response.status_code == 201
+    assert response.get_json()["images"][0].endswith(upload["key"])
+
+
+@pytest.mark.parametrize("files", [
+    ["front.jpg"],
+    [None],
+    [{"filename": "front.jpg", "content_type": 1}],
+    [{"filename": ["front.jpg"], "content_type": "image/jpeg"}],
+    [{"filename": "notes.txt", "content_type": "text/plain"}],
+])
+def test_presign_rejects_malformed_files(client, listing, r2_bucket, files):
+    property_id, headers = listing
+
+    response = client.post(
+        f"/properties/{property_id}/images/presign",
+        json={"files": files},
+        headers=headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("keys", [
+    [],
+    "rentwise-images/1/front.jpg",
+    [["a"]],
+    [{}],
+    ["rentwise-images/999/front.jpg"],
+])
+def test_finalize_rejects_malformed_keys(client, listing, r2_bucket, keys):
+    property_id, headers = listing
+
+    response = client.post(
+        f"/properties/{property_id}/images/finalize",
+        json={"keys": keys},
+        headers=headers
+    )
+    assert response.status_code == 400
@@ -0,0 +1,114 @@
+import csv
+import json
+
+import pytest
+
+from app.models.property import Property
+from app.services.property_import import normalize_listing
+from tests.conftest import add_user, auth_headers
+
+GOOD = {"city": "pune", "locality": "baner", "bedrooms": 2, "area_sqft": 950, "rent": 28000}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"city": 123},
+    {"locality": ["Baner"]},
+    {"city": ""},
+    {"rent": "inf"},
+    {"rent": "-inf"},
+    {"area_sqft": "nan"},
+    {"bedrooms": "two"},
+    {"bedrooms": None},
+    {"rent": 0},
+    {"description": {"text": "nice"}},
+])
+def test_normalize_listing_rejects_bad_values(overrides):
+    with pytest.raises(ValueError):
+        normalize_listing(dict(GOOD, **overrides))
+
+
+def test_normalize_listing_cleans_values():
+    listing = normalize_listing(dict(GOOD, city=" pune ", rent="28000.4"))
+    assert (listing["city"], listing["locality"], listing["rent"], listing["description"]) == ("Pune", "Baner", 28000, "")
+
+
+def run_import(app, client, body, fmt):
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+
+    response = client.post(
+        f"/properties/import?format={fmt}",
+        data=body,
+        content_type="application/octet-stream",
+        headers=auth_headers(app, owner_id)
+    )
+    assert response.status_code == 200
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[-1]["done"]
+    return lines[-1]
+
+
+def test_jsonl_import_reports_malformed_rows(app, client):
+    rows = [
+        json.dumps(GOOD),
+        json.dumps(dict(GOOD, city=123)),
+        json.dumps(dict(GOOD, rent="inf")),
+        json.dumps(dict(GOOD, area_sqft="nan")),
+        "[1, 2]",
+        "{not json",
+        json.dumps(dict(GOOD, locality="aundh")),
+    ]
+    summary = run_import(app, client, "\n".join(rows).encode(), "jsonl")
+
+    assert (summary["processed"], summary["inserted"], summary["failed"]) == (7, 2, 5)
+    assert [e["row"] for e in summary["errors"]] == [2, 3, 4, 5, 6]
+
+    with app.app_context():
+        assert sorted(p.locality for p in Property.query) == ["Aundh", "Baner"]
+
+
+def test_csv_import_reports_oversized_field(app, client):
+    header = "city,locality,bedrooms,area_sqft,rent\n"
+    body = (
+        header
+        + "Pune,Baner,2,950,28000\n"
+        + f"Pune,{'x' * (csv.field_size_limit() + 1)},2,950,28000\n"
+        + "Pune,Aundh,3,1200,35000\n"
+    )
+    summary = run_import(app, client, body.encode(), "csv")
+
+    assert (summary["inserted"], summary["failed"]) == (2, 1)
+    assert summary["errors"][0]["error"].startswith("Malformed CSV row")
+
+
+def test_import_stops_at_invalid_utf8(app, client):
+    body = (json.dumps(GOOD) + "\n").encode() + b'{"city": "\xff\xfe"}\n'
+    summary = run_import(app, client, body, "jsonl")
+
+    assert summary["failed"] == 1
+    assert "UTF-8" in summary["errors"][0]["error"]
+
+
+def test_abandoned_import_still_refreshes_for_committed_chunks(app):
+    import io
+
+    from flask import current_app
+    from app.models.job import Job
+    from app.services import response_cache
+    from app.services.property_import import import_listings
+
+    rows = "\n".join(json.dumps(dict(GOOD, rent=20000 + i)) for i in range(5))
+
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        cache = current_app.extensions["response_cache"]
+        generation = cache.generation(response_cache.LISTING)
+
+        updates = import_listings(io.BytesIO(rows.encode()), "jsonl", owner_id, chunk_size=2)
+        assert next(updates)["inserted"] == 2
+        updates.close()
+
+        assert Property.query.count() == 2
+        assert Job.query.filter_by(name="recompute_predictions").count() == 1
+        assert cache.generation(response_cache.LISTING) != generation
@@ -0,0 +1,58 @@
+import numpy as np
+
+from app.services.quantile_sketch import KLLSketch
+
+# Documented rank error for k=200
+RANK_ERROR = 0.0165
+
+FRACTIONS = np.linspace(0.01, 0.99, 99)
+
+
+def _rank_error(sketch, data):
+    # Worst gap between each requested fraction and the true rank of
+    # the value the sketch returns for it
+    data = np.sort(data)
+    estimates = sketch.quantiles(FRACTIONS)
+    true_ranks = np.searchsorted(data, estimates, side="right") / len(data)
+    return np.abs(true_ranks - FRACTIONS).max()
+
+
+def test_quantiles_stay_within_the_rank_error():
+    data = np.random.default_rng(0).lognormal(10, 0.5, 100_000)
+
+    sketch = KLLSketch(seed=1)
+    sketch.update_many(data)
+
+    assert _rank_error(sketch, data) <= RANK_ERROR
+
+    ranks = sketch.rank(np.quantile(data, FRACTIONS)) / len(data)
+    assert np.abs(ranks - FRACTIONS).max() <= RANK_ERROR
+
+
+def test_merged_sketch_keeps_the_rank_error():
+    rng = np.random.default_rng(2)
+    left = rng.normal(25000, 4000, 60_000)
+    right = rng.normal(40000, 8000, 40_000)
+
+    merged = KLLSketch(seed=3)
+    merged.update_many(left)
+    other = KLLSketch(seed=4)
+    for value in right:
+        other.update(value)
+    merged.merge(other)
+
+    data = np.concatenate([left, right])
+    assert merged.count == len(data)
+    assert (merged.min, merged.max) == (data.min(), data.max())
+    assert _rank_error(merged, data) <= RANK_ERROR
+
+
+def test_bytes_round_trip():
+    sketch = KLLSketch(seed=5)
+    sketch.update_many(np.random.default_rng(6).integers(8000, 90000, 20_000))
+
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+
+    assert restored.quantiles(FRACTIONS) == sketch.quantiles(FRACTIONS)
+    assert (restored.count, restored.min, restored.max) == (sketch.count, sketch.min, sketch.max)
+    assert restored.mean == sketch.mean
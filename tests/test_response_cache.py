@@ -0,0 +1,124 @@
+import pytest
+
+from app.services import response_cache
+from tests.conftest import add_properties, add_user, auth_headers
+
+
+@pytest.fixture(params=["memory", "filesystem"])
+def cached_app(request, make_app):
+    app = make_app(RESPONSE_CACHE_BACKEND=request.param)
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        customer_id = add_user("customer@example.com")
+        add_properties(owner_id, 12)
+    app.owner_id, app.customer_id = owner_id, customer_id
+    return app
+
+
+def test_repeat_request_is_served_from_cache(cached_app):
+    client = cached_app.test_client()
+
+    first = client.get("/properties/all?city=hyderabad")
+    second = client.get("/properties/all?city=hyderabad")
+
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert first.get_data() == second.get_data()
+    assert first.headers["ETag"] == second.headers["ETag"]
+
+
+def test_keyset_and_offset_pages_are_cached_separately(cached_app):
+    client = cached_app.test_client()
+
+    offset = client.get("/properties/all").get_json()
+    keyset = client.get("/properties/all?cursor=")
+    with_total = client.get("/properties/all?cursor=&include_total=true")
+
+    assert "current_page" in offset and "next_cursor" not in offset
+    assert keyset.headers["X-Cache"] == "MISS"
+    assert "next_cursor" in keyset.get_json() and "current_page" not in keyset.get_json()
+    assert with_total.headers["X-Cache"] == "MISS"
+    assert with_total.get_json()["total_items"] == 12
+
+
+def test_unknown_params_share_an_entry(cached_app):
+    client = cached_app.test_client()
+
+    client.get("/properties/all?sort=low")
+    response = client.get("/properties/all?sort=low&utm_source=mail")
+
+    assert response.headers["X-Cache"] == "HIT"
+
+
+def test_etag_revalidation_returns_304(cached_app):
+    client = cached_app.test_client()
+
+    etag = client.get("/properties/1").headers["ETag"]
+    response = client.get("/properties/1", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["Cache-Control"] == "public, no-cache"
+    assert "Authorization" in response.headers["Vary"]
+
+
+def test_authenticated_requests_bypass_the_cache(cached_app):
+    client = cached_app.test_client()
+    headers = auth_headers(cached_app, cached_app.customer_id)
+
+    client.get("/properties/all")
+    response = client.get("/properties/all", headers=headers)
+
+    assert "X-Cache" not in response.headers
+    assert response.headers["Cache-Control"] == "private, no-cache"
+    assert "Authorization" in response.headers["Vary"]
+
+
+def test_missing_property_is_not_cached(cached_app):
+    client = cached_app.test_client()
+
+    assert client.get("/properties/999").status_code == 404
+    assert "X-Cache" not in client.get("/properties/999").headers
+
+
+def test_writes_invalidate_listing_and_detail(cached_app):
+    client = cached_app.test_client()
+    owner = auth_headers(cached_app, cached_app.owner_id)
+    customer = auth_headers(cached_app, cached_app.customer_id)
+
+    client.get("/properties/all")
+    client.get("/properties/1")
+    client.get("/properties/2")
+
+    assert client.put("/properties/1", json={"rent": 99999}, headers=owner).status_code == 200
+
+    detail = client.get("/properties/1")
+    assert detail.headers["X-Cache"] == "MISS"
+    assert detail.get_json()["rent"] == 99999
+    assert client.get("/properties/all").headers["X-Cache"] == "MISS"
+    assert client.get("/properties/2").headers["X-Cache"] == "HIT"
+
+    assert client.post("/properties/2/review", json={"rating": 5}, headers=customer).status_code == 201
+
+    assert client.get("/properties/2").headers["X-Cache"] == "MISS"
+    assert client.get("/properties/all").headers["X-Cache"] == "MISS"
+
+
+def test_filesystem_invalidation_reaches_other_processes(make_app, tmp_path):
+    # Two apps on one database and cache directory stand in for two workers
+    shared = dict(
+        RESPONSE_CACHE_BACKEND="filesystem",
+        RESPONSE_CACHE_DIR=str(tmp_path / "shared-cache"),
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path}/shared.db"
+    )
+    web, worker = make_app(**shared), make_app(**shared)
+
+    with web.app_context():
+        add_properties(add_user("owner@example.com", role="renter"), 3)
+
+    client = web.test_client()
+    client.get("/properties/1")
+    assert client.get("/properties/1").headers["X-Cache"] == "HIT"
+
+    with worker.app_context():
+        response_cache.invalidate(1)
+
+    assert client.get("/properties/1").headers["X-Cache"] == "MISS"
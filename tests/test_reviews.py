@@ -0,0 +1,65 @@
+from sqlalchemy import event, text
+
+from app import db
+from app.models.property import Property
+from tests.conftest import add_properties, add_user, auth_headers
+
+
+def setup_property(app):
+    with app.app_context():
+        owner_id = add_user("owner@example.com", role="renter")
+        customer_id = add_user("customer@example.com")
+        property_id = add_properties(owner_id, 1)[0]
+    return customer_id, property_id
+
+
+def test_review_updates_rating_aggregates(app, client):
+    customer_id, property_id = setup_property(app)
+
+    response = client.post(
+        f"/properties/{property_id}/review",
+        json={"rating": 4, "comment": "Nice"},
+        headers=auth_headers(app, customer_id)
+    )
+    assert response.status_code == 201
+
+    with app.app_context():
+        property_obj = db.session.get(Property, property_id)
+        assert (property_obj.review_count, property_obj.rating_sum) == (1, 4)
+
+
+def test_concurrent_duplicate_review_is_rejected(app, client):
+    customer_id, property_id = setup_property(app)
+
+    with app.app_context():
+        engine = db.engine
+
+    # Another request from the same user wins the race: its review lands
+    # after our duplicate check but before our insert
+    raced = []
+
+    def competing_insert(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO reviews") and not raced:
+            raced.append(True)
+            with engine.begin() as other:
+                other.execute(
+                    text("INSERT INTO reviews (rating, comment, user_id, property_id) VALUES (5, '', :u, :p)"),
+                    {"u": customer_id, "p": property_id}
+                )
+
+    event.listen(engine, "before_cursor_execute", competing_insert)
+
+    response = client.post(
+        f"/properties/{property_id}/review",
+        json={"rating": 1},
+        headers=auth_headers(app, customer_id)
+    )
+
+    event.remove(engine, "before_cursor_execute", competing_insert)
+
+    assert raced
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "You have already reviewed this property."
+
+    with app.app_context():
+        assert db.session.get(Property, property_id).review_count == 0
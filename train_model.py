@@ -10,21 +10,20 @@ from sklearn.preprocessing import OneHotEncoder
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 
-np.random.seed(42)
+from app.services.market_data import (
+    CITY_CONFIG,
+    AREA_SQFT_RANGE,
+    BEDROOM_PREMIUM,
+    BEDROOM_RANGE,
+    MIN_RENT,
+    RENT_NOISE
+)
 
-city_config = {
-    "Hyderabad": {"base_rate": 28, "localities": {"Madhapur": 1.35, "Gachibowli": 1.40, "Kondapur": 1.25}},
-    "Chennai": {"base_rate": 26, "localities": {"T Nagar": 1.35, "Adyar": 1.30, "Velachery": 1.20}},
-    "Bengaluru": {"base_rate": 32, "localities": {"Whitefield": 1.30, "Koramangala": 1.45, "Indiranagar": 1.50}},
-    "Mumbai": {"base_rate": 55, "localities": {"Bandra": 1.50, "Andheri": 1.30, "Powai": 1.25}},
-    "Pune": {"base_rate": 30, "localities": {"Hinjewadi": 1.30, "Kothrud": 1.20, "Baner": 1.30}},
-    "Vijayawada": {"base_rate": 20, "localities": {"Benz Circle": 1.30, "Governorpet": 1.20}},
-    "Guntur": {"base_rate": 16, "localities": {"Brodipet": 1.25, "Arundelpet": 1.20}}
-}
+np.random.seed(42)
 
 data = []
 
-for city, config in city_config.items():
+for city, config in CITY_CONFIG.items():
     base_rate = config["base_rate"]
     localities = config["localities"]
 
@@ -32,18 +31,18 @@ for city, config in city_config.items():
         locality = np.random.choice(list(localities.keys()))
         locality_multiplier = localities[locality]
 
-        bedrooms = np.random.randint(1, 5)
-        area_sqft = np.random.randint(450, 2500)
+        bedrooms = np.random.randint(*BEDROOM_RANGE)
+        area_sqft = np.random.randint(*AREA_SQFT_RANGE)
 
-        bedroom_premium = bedrooms * 2000
+        bedroom_premium = bedrooms * BEDROOM_PREMIUM
 
         rent = (
             area_sqft * base_rate * locality_multiplier
             + bedroom_premium
-            + np.random.randint(-3000, 3000)
+            + np.random.randint(*RENT_NOISE)
         )
 
-        rent = max(5000, rent)
+        rent = max(MIN_RENT, rent)
 
         data.append([city, locality, bedrooms, area_sqft, rent])
 
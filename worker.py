@@ -0,0 +1,7 @@
+from app import create_app
+from app.services.jobs import run_worker
+
+app = create_app()
+
+if __name__ == "__main__":
+    run_worker(app)